@@ -4,16 +4,29 @@ import shutil
 import hashlib
 import time
 import threading
+import multiprocessing
 import json
+import queue
+import functools
+import importlib.util
+import heapq
 import csv
+import re
+import fnmatch
+import mmap
+import sqlite3
 import tempfile
 import uuid
 import platform
+import urllib.request
+import urllib.error
 import subprocess
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import concurrent.futures
-from collections import defaultdict
+from types import MappingProxyType
+from collections import defaultdict, OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 
 try:
@@ -26,19 +39,266 @@ except ImportError:
 try:
     from PIL import Image, ImageTk, ImageDraw
     import cv2
-    import imagehash
     import numpy as np
 except ImportError:
-    print("Missing dependencies. Run: pip install pillow opencv-python-headless imagehash")
+    print("Missing dependencies. Run: pip install pillow opencv-python-headless numpy")
     sys.exit(1)
 
 try:
-    from reportlab.pdfgen import canvas
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib.utils import ImageReader
-    HAS_REPORTLAB = True
+    from blake3 import blake3
+    HAS_BLAKE3 = True
 except ImportError:
-    HAS_REPORTLAB = False
+    HAS_BLAKE3 = False
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+try:
+    import cupy as cp
+    HAS_CUPY = cp.cuda.runtime.getDeviceCount() > 0
+except Exception: # Not installed, or installed without a usable CUDA device/driver
+    HAS_CUPY = False
+
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    import win32com.client # pywin32, Windows only
+    HAS_WIN32COM = True
+except ImportError:
+    HAS_WIN32COM = False
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# reportlab is only probed here; export_pdf imports it on first use so startup doesn't pay for it
+HAS_REPORTLAB = importlib.util.find_spec("reportlab") is not None
+
+APP_VERSION = "1.1.1"
+RELEASES_URL = "https://api.github.com/repos/skingers/DedupSuite/releases/latest" # Queried by check_updates
+
+# Content hashes are only used for equality, so prefer the much faster BLAKE3 when available
+HASH_ALGO = "blake3" if HAS_BLAKE3 else "sha256"
+MMAP_HASH_MIN = 64 * 1024 * 1024 # Files at least this large are hashed via blake3's multi-threaded mmap path
+BLOCK_START = 2048 # First block read when comparing candidates; each following block doubles in size
+BLOCK_MAX = 64 * 1024 * 1024 # Doubling stops here so a single block never holds more than this much in flight
+MMAP_READ_MIN = 1024 * 1024 # Ranges at least this large are read through mmap so the kernel can prefetch ahead
+SSD_THREADS = min(32, (os.cpu_count() or 1) * 4) # SSDs keep scaling with outstanding I/O well past the core count
+STILL_EXTS = frozenset({'.jpg', '.jpeg', '.png', '.bmp'})
+VIDEO_EXTS = frozenset({'.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v'})
+PROCESS_POOL_MIN = 64 # Fewer uncached media files than this are fingerprinted on threads; spawning workers costs seconds
+PARTIAL_HASH_SIZE = 65536 # FolderMerger compares this much of each size-matched pair before hashing whole files
+CLUSTER_CHUNK = 1024 # Seeds per Numba clustering call; pause and stop are checked between calls
+GRAB_SKIP_MAX = 48 # Gaps up to this many frames are skipped with grab(); longer ones seek
+PDF_ROWS_PER_PAGE = 33 # Rows at y = 750, 730, ... 110
+THUMB_CACHE_MAX_BYTES = 128 * 1024 * 1024 # Decoded RGBA bytes of review previews kept in memory
+
+def fast_move(src, dst):
+    # Same-filesystem moves are a single rename; anything rename refuses (cross-device, existing target on Windows)
+    # goes through shutil.move exactly as before
+    try: os.rename(src, dst)
+    except FileNotFoundError: raise # Nothing shutil.move could do better
+    except OSError: shutil.move(str(src), str(dst))
+
+def lock_owner(folder):
+    # Opens folder/.owner and takes a non-blocking exclusive lock, held for as long as the returned file stays open.
+    # None means another live process owns the folder. The OS drops the lock when its owner dies, however it dies.
+    f = open(os.path.join(folder, ".owner"), "a+b")
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0); msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return f
+    except OSError:
+        f.close(); return None
+
+def purge_dir(path):
+    # Removes a flat folder of files. On POSIX every unlink is relative to one open directory fd, skipping a full
+    # path lookup per file; elsewhere (or for anything nested) rmtree does the work.
+    if hasattr(os, 'O_DIRECTORY') and os.unlink in os.supports_dir_fd:
+        try:
+            dfd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                for name in os.listdir(dfd):
+                    try: os.unlink(name, dir_fd=dfd)
+                    except OSError: pass
+            finally: os.close(dfd)
+            os.rmdir(path)
+            return
+        except OSError: pass
+    shutil.rmtree(path, ignore_errors=True)
+
+def new_hasher():
+    return blake3() if HAS_BLAKE3 else hashlib.sha256()
+
+def read_head(filepath, length):
+    # First `length` bytes with a single pread (no buffered file object), or None if the file can't be read
+    try:
+        fd = os.open(filepath, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try: return os.pread(fd, length, 0) if hasattr(os, 'pread') else os.read(fd, length)
+        finally: os.close(fd)
+    except OSError: return None
+
+def quick_key(data):
+    # 64-bit non-cryptographic screen; the builtin bytes hash is stable within a run, which is all a screen needs
+    return xxhash.xxh3_64_intdigest(data) if HAS_XXHASH else hash(data)
+
+def hash_large_file(filepath):
+    # Lets blake3 spread a single big file across SIMD lanes and threads
+    return blake3(max_threads=blake3.AUTO).update_mmap(str(filepath)).digest()
+
+# Rows 0-7 of the unnormalised 32-point DCT-II matrix (scipy.fftpack's convention, as used by imagehash.phash)
+_DCT8 = 2 * np.cos(np.pi * np.arange(8)[:, None] * (2 * np.arange(32)[None, :] + 1) / 64)
+
+_BIT_SHIFTS = np.arange(63, -1, -1, dtype=np.uint64) # First coefficient becomes the most significant bit
+
+def shrink_frame(frame):
+    # BGR or grayscale frame -> the 32x32 grayscale thumbnail a pHash is computed from
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA)
+
+def phash_small(small, xp=np):
+    # 64-bit perceptual hashes for a (B, 32, 32) stack of thumbnails, written against the array module `xp` so the
+    # same code runs on NumPy or CuPy. The 8x8 low-frequency DCT block of every thumbnail comes from one batched
+    # matmul; bits are set where a coefficient exceeds its block median.
+    dct = xp.asarray(_DCT8)
+    low = (dct @ xp.asarray(small, dtype=xp.float64) @ dct.T).reshape(len(small), 64)
+    bits = (low > xp.median(low, axis=1)[:, None]).astype(xp.uint64)
+    return (bits << xp.asarray(_BIT_SHIFTS)).sum(axis=1, dtype=xp.uint64)
+
+def open_capture(path):
+    # VideoCapture with hardware decoding (NVDEC/QuickSync/...) requested where this OpenCV build supports it
+    path = str(path)
+    if hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+        cap = cv2.VideoCapture(path, cv2.CAP_ANY, [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+        if cap.isOpened(): return cap
+    return cv2.VideoCapture(path)
+
+popcount = int.bit_count if hasattr(int, 'bit_count') else (lambda x: bin(x).count('1')) # int.bit_count is 3.10+
+
+def popcount_array(x):
+    # Per-element bit counts of a uint64 array (np.bitwise_count is NumPy 2.0+)
+    if hasattr(np, 'bitwise_count'): return np.bitwise_count(x)
+    return np.unpackbits(x.view(np.uint8)).reshape(len(x), 64).sum(axis=1)
+
+def load_still_small(filepath):
+    try:
+        with Image.open(filepath) as img: return shrink_frame(np.asarray(img.convert("L")))
+    except Exception: return None
+
+def compute_fingerprint(filepath):
+    # Tuple of packed 64-bit pHashes: one for a still image, three (10/50/90%) for a video. Module level so it can run in
+    # VideoFileAuditor's worker processes; it takes and returns only small picklable values.
+    try:
+        if os.path.splitext(filepath)[1].lower() in STILL_EXTS:
+            small = load_still_small(filepath)
+            return (int(phash_small(small[None])[0]),) if small is not None else None
+        
+        cap = open_capture(filepath)
+        try:
+            if not cap.isOpened(): return None
+            count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            if count < 10: return None
+            # Targets are visited in ascending order so seeks only go forward; short gaps are skipped with grab(),
+            # which avoids the keyframe re-decode a seek costs. Only the three target frames are retrieved.
+            frames, pos = [], 0
+            for target in (int(count * 0.1), int(count * 0.5), int(count * 0.9)):
+                if target - pos > GRAB_SKIP_MAX: cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                else:
+                    for _ in range(target - pos): cap.grab()
+                pos = target + 1
+                if cap.grab():
+                    ret, frame = cap.retrieve()
+                    if ret: frames.append(shrink_frame(frame))
+                frame = None
+            return tuple(int(h) for h in phash_small(np.stack(frames))) if len(frames) == 3 else None
+        finally: cap.release()
+    except Exception: return None # Broad exception is okay here as many things can fail in video processing
+
+def _fingerprint_worker_init():
+    # Each worker process decodes one file at a time; OpenCV's own thread pool would only oversubscribe the cores
+    cv2.setNumThreads(1)
+
+if HAS_NUMBA:
+    # On-disk caching needs a real source file beside a writable __pycache__; the frozen build has neither
+    NUMBA_CACHE = not getattr(sys, 'frozen', False)
+
+    @numba.njit(cache=NUMBA_CACHE)
+    def _popcount_nb(x):
+        # SWAR bit count; LLVM lowers this to a single POPCNT where the CPU has one
+        x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+        x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+        x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+        return (x * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+    @numba.njit(parallel=True, cache=NUMBA_CACHE)
+    def _cluster_greedy(hashes, threshold, labels, start, stop):
+        # Same seeding as the BK-tree path: each unclaimed row in order claims every later unclaimed row within
+        # threshold. labels (-1 = unclaimed) receives the seed index of each row. Only seeds start..stop-1 are run, so
+        # the caller can poll pause/stop between chunks; the candidate scan for each seed runs across all cores.
+        n, k = hashes.shape
+        for i in range(start, stop):
+            if labels[i] != -1: continue
+            labels[i] = i
+            for j in numba.prange(i + 1, n):
+                if labels[j] == -1:
+                    d = 0
+                    for c in range(k): d += _popcount_nb(hashes[i, c] ^ hashes[j, c])
+                    if d <= threshold: labels[j] = i
+        return labels
+
+def _walk_concurrent(root, ignore_folders=(), ignore_exts=(), exclude=(), threads=8, ignore_re=None, prestat=False):
+    # Yields file DirEntry objects under root, keeping many directories in flight at once (a big win on network shares).
+    # Ignored folders (exact names, plus an optional compiled pattern) and excluded paths are pruned before their
+    # subtree is ever listed. With prestat, each file's stat is taken on the listing thread; DirEntry caches it, so the
+    # consumer's entry.stat() is free instead of one serial syscall per file (Windows already fills it from the listing).
+    multi_exts = tuple(e for e in ignore_exts if e.count('.') > 1) # ".tar.gz", ".min.js": matched with endswith
+    def scan(path):
+        subdirs, files = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            name = entry.name.lower()
+                            if name in ignore_folders or (ignore_re and ignore_re.match(name)): continue
+                            if entry.path not in exclude: subdirs.append(entry.path)
+                        elif entry.is_file():
+                            if ignore_exts: # Set lookup on the final extension, instead of lowercasing every full name
+                                name = entry.name; dot = name.rfind('.')
+                                if dot >= 0 and name[dot:].lower() in ignore_exts: continue
+                                if multi_exts and name.lower().endswith(multi_exts): continue
+                            if prestat:
+                                try: entry.stat()
+                                except OSError: pass # Left for the consumer's own stat to report
+                            files.append(entry)
+                    except OSError: continue
+        except OSError: pass
+        return subdirs, files
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, threads))
+    try:
+        pending = {executor.submit(scan, str(root))}
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                subdirs, files = future.result()
+                pending.update(executor.submit(scan, d) for d in subdirs)
+                yield from files
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 # ==========================================
 #               HELPER CLASSES
@@ -51,101 +311,281 @@ class ConfigManager:
             base_path = os.path.dirname(sys.executable)
         else:
             base_path = os.path.dirname(os.path.abspath(__file__))
+        self.base_path = base_path
         self.filename = os.path.join(base_path, filename)
-        self.defaults = {
+        self.defaults = MappingProxyType({
             "last_source": "", "last_dest": "", "scan_mode": "Exact Match (Fast)",
             "threshold": 0, "threads": 4, "ignore_exts": "", "ignore_folders": "",
-            "theme": "light", "merge_master": "", "merge_incoming": ""
-        }
+            "theme": "light", "merge_master": "", "merge_incoming": "", "ssd_mode": False,
+            "update_etag": "", "update_latest": ""
+        }) # Read-only; callers take their own dict()
+        self._saved = None # Serialized form of what is on disk, so unchanged settings are never rewritten
 
     def load(self):
-        if not os.path.exists(self.filename): return self.defaults.copy()
         try:
-            with open(self.filename, "r") as f:
-                config = self.defaults.copy()
-                config.update(json.load(f))
+            with open(self.filename, "rb") as f:
+                config = dict(self.defaults)
+                config.update(json_loads(f.read()))
+                self._saved = json.dumps(config, indent=4)
                 return config
-        except: return self.defaults.copy()
+        except: return dict(self.defaults) # Missing or unreadable file
 
     def save(self, data):
+        text = json.dumps(data, indent=4)
+        if text == self._saved: return
         try:
-            with open(self.filename, "w") as f: json.dump(data, f, indent=4)
+            with open(self.filename, "w") as f: f.write(text)
+            self._saved = text
         except: pass
 
-class IconFactory:
+class HashCache:
+    # Full-content digests persisted across runs, keyed by (path, size, mtime_ns) so unchanged files are never re-read
+    SCHEMA = "CREATE TABLE IF NOT EXISTS hashes (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, algo TEXT, digest BLOB)"
+    INSERT = "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)"
+
+    TABLE = "hashes"
+    VERSION = 0 # Bump when stored values stop being comparable with freshly computed ones
+
+    def __init__(self, db_path, batch_size=500):
+        self.lock = threading.Lock()
+        self.batch_size = batch_size
+        self.pending = []
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != self.VERSION:
+            self.conn.execute(f"DROP TABLE IF EXISTS {self.TABLE}")
+            self.conn.execute(f"PRAGMA user_version={self.VERSION}")
+        self.conn.execute(self.SCHEMA)
+        self.conn.commit()
+
+    def get(self, path, size, mtime_ns):
+        # Rows written with a different algorithm (blake3 vs sha256) are treated as misses
+        try:
+            with self.lock:
+                row = self.conn.execute("SELECT digest FROM hashes WHERE path=? AND size=? AND mtime_ns=? AND algo=?",
+                                        (str(path), size, mtime_ns, HASH_ALGO)).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error: return None
+
+    def put(self, path, size, mtime_ns, digest):
+        self._queue((str(path), size, mtime_ns, HASH_ALGO, digest))
+
+    def _queue(self, row):
+        with self.lock:
+            self.pending.append(row)
+            if len(self.pending) >= self.batch_size: self._flush()
+
+    def flush(self):
+        with self.lock: self._flush()
+
+    def _flush(self):
+        if not self.pending: return
+        try:
+            self.conn.executemany(self.INSERT, self.pending)
+            self.conn.commit()
+        except sqlite3.Error: pass
+        self.pending.clear()
+
+    def close(self):
+        # Under the lock so a scan thread still using a shared cache never races the close
+        with self.lock:
+            self._flush()
+            self.conn.close()
+
+class BKTree:
+    # Metric tree over fingerprint tuples of packed 64-bit hashes; distance is the summed Hamming distance per frame.
+    # Nodes are [key, value, {edge distance: child}].
+    def __init__(self):
+        self.root = None
+
     @staticmethod
-    def create_icons(color="#ffffff"):
-        icons = {}
-        def new_img(): return Image.new("RGBA", (20, 20), (0, 0, 0, 0))
-        
-        def make_ctk(img):
-            return ctk.CTkImage(light_image=img, dark_image=img, size=(20, 20))
-        
-        # Folder (Browse)
-        img = new_img(); d = ImageDraw.Draw(img)
-        d.polygon([(2, 4), (6, 4), (8, 6), (14, 6), (14, 12), (2, 12)], outline=color, fill=None)
-        d.rectangle([3, 7, 13, 11], fill=color)
-        icons['folder'] = make_ctk(img)
-
-        # Play (Start)
-        img = new_img(); d = ImageDraw.Draw(img)
-        d.polygon([(5, 3), (5, 13), (13, 8)], fill=color)
-        icons['play'] = make_ctk(img)
-
-        # Pause
-        img = new_img(); d = ImageDraw.Draw(img)
-        d.rectangle([4, 3, 6, 13], fill=color); d.rectangle([10, 3, 12, 13], fill=color)
-        icons['pause'] = make_ctk(img)
-
-        # Stop
-        img = new_img(); d = ImageDraw.Draw(img)
-        d.rectangle([4, 4, 12, 12], fill=color)
-        icons['stop'] = make_ctk(img)
-        
-        # Save
-        img = new_img(); d = ImageDraw.Draw(img)
-        d.rectangle([3, 3, 13, 13], outline=color); d.rectangle([5, 3, 11, 5], fill=color); d.rectangle([5, 9, 11, 11], fill=color)
-        icons['save'] = make_ctk(img)
-        
-        # Trash
-        img = new_img(); d = ImageDraw.Draw(img)
-        d.rectangle([5, 5, 11, 13], outline=color); d.line([(4, 3), (12, 3)], fill=color); d.line([(7, 2), (9, 2)], fill=color)
-        icons['trash'] = make_ctk(img)
-        
-        # Refresh/Reset
-        img = new_img(); d = ImageDraw.Draw(img)
-        d.arc([3, 3, 13, 13], 0, 270, fill=color, width=2); d.polygon([(13, 3), (13, 7), (9, 3)], fill=color)
-        icons['refresh'] = make_ctk(img)
-        
-        # Search
-        img = new_img(); d = ImageDraw.Draw(img)
-        d.ellipse([3, 3, 10, 10], outline=color, width=2); d.line([(9, 9), (13, 13)], fill=color, width=2)
-        icons['search'] = make_ctk(img)
-        
-        # Arrow Right
-        img = new_img(); d = ImageDraw.Draw(img)
-        d.line([(3, 8), (11, 8)], fill=color, width=2); d.polygon([(11, 5), (11, 11), (14, 8)], fill=color)
-        icons['arrow'] = make_ctk(img)
-        
-        # Check
-        img = new_img(); d = ImageDraw.Draw(img)
-        d.line([(3, 8), (6, 11), (13, 4)], fill=color, width=2)
-        icons['check'] = make_ctk(img)
-
-        # Close
-        img = new_img(); d = ImageDraw.Draw(img)
-        d.line([(4, 4), (12, 12)], fill=color, width=2); d.line([(4, 12), (12, 4)], fill=color, width=2)
-        icons['close'] = make_ctk(img)
+    def distance(a, b):
+        return sum(popcount(x ^ y) for x, y in zip(a, b))
+
+    def add(self, key, value):
+        node = [key, value, {}]
+        if self.root is None: self.root = node; return
+        cur = self.root
+        while True:
+            d = self.distance(key, cur[0])
+            child = cur[2].get(d)
+            if child is None: cur[2][d] = node; return
+            cur = child
+
+    def search(self, key, threshold):
+        # Triangle inequality: matches can only live under edges within [d - threshold, d + threshold]
+        results = []
+        stack = [self.root] if self.root else []
+        while stack:
+            k, v, children = stack.pop()
+            d = self.distance(key, k)
+            if d <= threshold: results.append((v, d))
+            stack.extend(child for ed, child in children.items() if d - threshold <= ed <= d + threshold)
+        return results
+
+class FingerprintCache(HashCache):
+    # Perceptual hashes of media files, one 64-bit int per sampled frame (ph1/ph2 are NULL for still images).
+    # SQLite integers are signed, so values are stored in two's complement form.
+    TABLE = "fingerprints"
+    VERSION = 1 # 1: OpenCV INTER_AREA resize + batched DCT replaced imagehash.phash
+    SCHEMA = "CREATE TABLE IF NOT EXISTS fingerprints (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, ph0 INTEGER, ph1 INTEGER, ph2 INTEGER)"
+    INSERT = "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?, ?, ?)"
+
+    def get(self, path, size, mtime_ns):
+        try:
+            with self.lock:
+                row = self.conn.execute("SELECT ph0, ph1, ph2 FROM fingerprints WHERE path=? AND size=? AND mtime_ns=?",
+                                        (str(path), size, mtime_ns)).fetchone()
+            return tuple(v & 0xFFFFFFFFFFFFFFFF for v in row if v is not None) if row else None
+        except sqlite3.Error: return None
+
+    def put(self, path, size, mtime_ns, hashes):
+        signed = [v - (1 << 64) if v >= 1 << 63 else v for v in hashes]
+        self._queue((str(path), size, mtime_ns, *(signed + [None] * (3 - len(signed)))))
+
+class ThumbnailCache:
+    # Preview thumbnails on disk, one WebP per (path, mtime, size). A changed file gets a new key, so stale entries
+    # are simply never read again and age out through prune().
+    def __init__(self, directory=None, max_bytes=200 * 1024 * 1024):
+        self.dir = Path(directory) if directory else Path(tempfile.gettempdir()) / "dedup_thumbs"
+        self.max_bytes = max_bytes
+        try: self.dir.mkdir(parents=True, exist_ok=True)
+        except OSError: pass
+
+    def _file(self, path, st):
+        key = hashlib.blake2b(f"{path}|{st.st_mtime_ns}|{st.st_size}".encode(), digest_size=16).hexdigest()
+        return self.dir / f"{key}.webp"
+
+    def get(self, path, st):
+        try:
+            with Image.open(self._file(path, st)) as img:
+                img.load()
+                return img.copy()
+        except Exception: return None
+
+    def put(self, path, st, img):
+        # Written under a unique name and renamed into place so a concurrent reader never sees half a file
+        target = self._file(path, st)
+        tmp = target.with_name(f"{target.stem}.{uuid.uuid4().hex}.tmp")
+        try:
+            img.save(tmp, "WEBP", quality=80)
+            os.replace(tmp, target)
+        except Exception:
+            try: os.remove(tmp)
+            except OSError: pass
+
+    def prune(self):
+        # Least recently accessed thumbnails go first until the directory is back under max_bytes
+        entries = []
+        try:
+            with os.scandir(self.dir) as it:
+                for e in it:
+                    if not e.name.endswith(('.webp', '.tmp')): continue
+                    try: st = e.stat()
+                    except OSError: continue # Removed since the listing (another dialog, a temp cleaner)
+                    entries.append((st.st_atime, st.st_size, e.path))
+        except OSError: return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes: break
+            try: os.remove(path); total -= size
+            except OSError: pass
+
+@functools.lru_cache(maxsize=8)
+def create_icon_images(color="#ffffff"):
+    # Plain PIL images per color; a hit skips all the drawing. IconFactory wraps them in CTkImages, whose
+    # PhotoImages (which need a live Tk root) are only created when first displayed.
+    icons = {}
+    def new_img(): return Image.new("RGBA", (20, 20), (0, 0, 0, 0))
+    
+    # Folder (Browse)
+    img = new_img(); d = ImageDraw.Draw(img)
+    d.polygon([(2, 4), (6, 4), (8, 6), (14, 6), (14, 12), (2, 12)], outline=color, fill=None)
+    d.rectangle([3, 7, 13, 11], fill=color)
+    icons['folder'] = img
+
+    # Play (Start)
+    img = new_img(); d = ImageDraw.Draw(img)
+    d.polygon([(5, 3), (5, 13), (13, 8)], fill=color)
+    icons['play'] = img
+
+    # Pause
+    img = new_img(); d = ImageDraw.Draw(img)
+    d.rectangle([4, 3, 6, 13], fill=color); d.rectangle([10, 3, 12, 13], fill=color)
+    icons['pause'] = img
+
+    # Stop
+    img = new_img(); d = ImageDraw.Draw(img)
+    d.rectangle([4, 4, 12, 12], fill=color)
+    icons['stop'] = img
+    
+    # Save
+    img = new_img(); d = ImageDraw.Draw(img)
+    d.rectangle([3, 3, 13, 13], outline=color); d.rectangle([5, 3, 11, 5], fill=color); d.rectangle([5, 9, 11, 11], fill=color)
+    icons['save'] = img
+    
+    # Trash
+    img = new_img(); d = ImageDraw.Draw(img)
+    d.rectangle([5, 5, 11, 13], outline=color); d.line([(4, 3), (12, 3)], fill=color); d.line([(7, 2), (9, 2)], fill=color)
+    icons['trash'] = img
+    
+    # Refresh/Reset
+    img = new_img(); d = ImageDraw.Draw(img)
+    d.arc([3, 3, 13, 13], 0, 270, fill=color, width=2); d.polygon([(13, 3), (13, 7), (9, 3)], fill=color)
+    icons['refresh'] = img
+    
+    # Search
+    img = new_img(); d = ImageDraw.Draw(img)
+    d.ellipse([3, 3, 10, 10], outline=color, width=2); d.line([(9, 9), (13, 13)], fill=color, width=2)
+    icons['search'] = img
+    
+    # Arrow Right
+    img = new_img(); d = ImageDraw.Draw(img)
+    d.line([(3, 8), (11, 8)], fill=color, width=2); d.polygon([(11, 5), (11, 11), (14, 8)], fill=color)
+    icons['arrow'] = img
+    
+    # Check
+    img = new_img(); d = ImageDraw.Draw(img)
+    d.line([(3, 8), (6, 11), (13, 4)], fill=color, width=2)
+    icons['check'] = img
+
+    # Close
+    img = new_img(); d = ImageDraw.Draw(img)
+    d.line([(4, 4), (12, 12)], fill=color, width=2); d.line([(4, 12), (12, 4)], fill=color, width=2)
+    icons['close'] = img
+    return icons
+
+class IconFactory:
+    # CTkImages are shared by every window of the one Tk interpreter, so each color's set is built once per process
+    _cache = {}
+
+    @classmethod
+    def create_icons(cls, color="#ffffff"):
+        icons = cls._cache.get(color)
+        if icons is None:
+            icons = cls._cache[color] = {name: ctk.CTkImage(light_image=img, dark_image=img, size=(20, 20))
+                                         for name, img in create_icon_images(color).items()}
         return icons
 
 # ==========================================
 #               LOGIC CLASSES
 # ==========================================
 
+@dataclass(frozen=True)
+class AuditConfig:
+    # Snapshot of the scan-relevant settings, taken once when a scan starts (slots declared by hand for 3.9)
+    __slots__ = ('threshold', 'threads', 'ignore_exts', 'ignore_folders')
+    threshold: int
+    threads: int
+    ignore_exts: frozenset
+    ignore_folders: frozenset
+
 class FileAuditor:
     def __init__(self, root_path, move_to=None, delete=False, dry_run=True, threads=4, report_file=None, 
                  log_callback=None, progress_callback=None, stop_event=None, ignore_exts=None, ignore_folders=None, 
-                 threshold=0, review_mode=False, pause_event=None):
+                 threshold=0, review_mode=False, pause_event=None, hash_store=None, config=None):
+        if config: threshold, threads, ignore_exts, ignore_folders = config.threshold, config.threads, config.ignore_exts, config.ignore_folders
+        self.config = config
         self.root_path = Path(root_path).resolve()
         self.move_to = Path(move_to).resolve() if move_to else None
         self.delete = delete
@@ -156,98 +596,167 @@ class FileAuditor:
         self.update_progress = progress_callback if progress_callback else lambda x, y, z: None
         self.stop_event = stop_event if stop_event else threading.Event()
         self.pause_event = pause_event if pause_event else threading.Event(); self.pause_event.set()
-        self.ignore_exts = tuple(e.lower() for e in ignore_exts) if ignore_exts else ()
-        self.ignore_folders = set(f.lower() for f in ignore_folders) if ignore_folders else set()
+        self.ignore_exts = frozenset(e.lower() if e.startswith('.') else '.' + e.lower() for e in ignore_exts) if ignore_exts else frozenset()
+        # Plain folder names stay a set lookup; wildcard rules ("tmp*", "build-?") are folded into one regex. Only * and ?
+        # are wildcards: brackets stay literal ("[old]", "[old]*"), as Windows folder names often contain them.
+        folders = frozenset(f.lower() for f in ignore_folders) if ignore_folders else frozenset()
+        globs = [f for f in folders if '*' in f or '?' in f]
+        self.ignore_folders = folders.difference(globs)
+        self.ignore_folder_re = re.compile('|'.join(fnmatch.translate(g.replace('[', '[[]')) for g in globs)) if globs else None
         self.threshold = threshold
         self.review_mode = review_mode
+        self.hash_store = hash_store
         self.found_groups = []
         self.files_scanned = 0
         self.duplicates_found = 0
         self.bytes_saved = 0
 
-    def get_partial_hash(self, filepath):
+    def _should_abort(self):
+        # is_set() is a plain flag read; wait() takes the Event's condition lock even when already set, so it is
+        # only entered while actually paused
+        if not self.pause_event.is_set(): self.pause_event.wait()
+        return self.stop_event.is_set()
+
+    def get_head_key(self, filepath, length):
+        # First block of a file screened with a 64-bit non-cryptographic hash. Collisions are harmless: survivors are
+        # compared again by their full digest.
+        data = read_head(filepath, length)
+        return (quick_key(data), data) if data is not None else None
+
+    def get_file_hash(self, filepath, hasher=None, offset=0, length=None, chunk_size=4194304):
+        # Feeds `length` bytes from `offset` (default: the whole file) into hasher and returns its running digest.
+        # Pause/stop are polled every 16 chunks (64 MiB) rather than per chunk; a stop abandons the file mid-read.
         try:
+            if hasher is None:
+                if HAS_BLAKE3 and length is None and os.path.getsize(filepath) >= MMAP_HASH_MIN: return hash_large_file(filepath)
+                hasher = new_hasher()
             with open(filepath, 'rb') as f:
-                return hashlib.sha256(f.read(4096)).hexdigest()
-        except: return None
-
-    def get_file_hash(self, filepath, chunk_size=1048576):
-        hasher = hashlib.sha256()
-        try:
-            with open(filepath, 'rb') as f:
-                while chunk := f.read(chunk_size):
-                    self.pause_event.wait()
-                    hasher.update(chunk)
-            return hasher.hexdigest()
+                end = os.fstat(f.fileno()).st_size if length is None else offset + length
+                if end - offset >= MMAP_READ_MIN:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if hasattr(mmap, 'MADV_SEQUENTIAL'): # Not available on Windows
+                            start = offset - offset % mmap.PAGESIZE
+                            mm.madvise(mmap.MADV_SEQUENTIAL, start, end - start)
+                            mm.madvise(mmap.MADV_WILLNEED, start, end - start)
+                        with memoryview(mm) as view:
+                            for n, pos in enumerate(range(offset, end, chunk_size)):
+                                if not n & 15 and self._should_abort(): return None
+                                hasher.update(view[pos:min(pos + chunk_size, end)])
+                else:
+                    f.seek(offset)
+                    remaining = end - offset
+                    n = 0
+                    while remaining > 0 and (chunk := f.read(min(chunk_size, remaining))):
+                        if not n & 15 and self._should_abort(): return None
+                        hasher.update(chunk)
+                        remaining -= len(chunk)
+                        n += 1
+            return hasher.digest()
         except: return None
 
     def run(self):
         self.log(f"--- Starting Exact Audit on: {self.root_path} ---")
         size_map = defaultdict(list)
+        inode_map = {} # (st_dev, st_ino) -> first path seen; hardlinks to it are equal without hashing
+        links = defaultdict(list)
+        mtimes = {}
         self.update_progress(0, 0, "Scanning file sizes...")
         
-        for dirpath, dirnames, filenames in os.walk(self.root_path):
-            self.pause_event.wait()
+        exclude = {str(self.move_to)} if self.move_to else ()
+        for entry in _walk_concurrent(self.root_path, self.ignore_folders, self.ignore_exts, exclude, self.threads, self.ignore_folder_re, prestat=True):
+            if not self.pause_event.is_set(): self.pause_event.wait()
             if self.stop_event.is_set(): break
-            dirnames[:] = [d for d in dirnames if d.lower() not in self.ignore_folders]
-            if self.move_to and self.move_to in Path(dirpath).parents: continue
-            for filename in filenames:
-                self.pause_event.wait()
-                if self.stop_event.is_set(): break
-                if filename.lower().endswith(self.ignore_exts): continue
-                filepath = Path(dirpath) / filename
-                try:
-                    size = filepath.stat().st_size
-                    size_map[size].append(filepath)
-                    self.files_scanned += 1
-                    if self.files_scanned % 100 == 0: self.update_progress(0, 1, f"Scanning: {self.files_scanned} files") # Use 0/1 for indeterminate
-                except OSError: continue
+            filepath = entry.path # Plain str until a group is reported; Path objects are only built for duplicates
+            try:
+                st = entry.stat()
+                self.files_scanned += 1
+                if st.st_ino: # 0 where the platform has no inode numbers; fall through to hashing
+                    first = inode_map.setdefault((st.st_dev, st.st_ino), filepath)
+                    if first is not filepath:
+                        links[first].append(filepath)
+                        continue
+                size_map[st.st_size].append(filepath)
+                mtimes[filepath] = st.st_mtime_ns
+                if self.files_scanned % 100 == 0: self.update_progress(0, 1, f"Scanning: {self.files_scanned} files") # Use 0/1 for indeterminate
+            except OSError: continue
+
+        def report(paths):
+            # Sorted because the concurrent walk and as_completed hand paths over in a different order on every run
+            group = [Path(p) for p in sorted(p for fp in paths for p in (fp, *links.get(fp, ())))]
+            if len(group) > 1: self.handle_duplicates(group)
 
-        potential_dupes = {s: p for s, p in size_map.items() if len(p) > 1}
-        
-        # Phase 1: Partial Hashing (Pre-screen)
-        partial_tasks = [(fp, s) for s, paths in potential_dupes.items() for fp in paths]
-        full_tasks = []
-        processed_groups = defaultdict(lambda: defaultdict(list))
-        
-        if partial_tasks:
-            self.update_progress(0, len(partial_tasks), "Pre-screening files...")
-            partial_map = defaultdict(list)
-            with concurrent.futures.ThreadPoolExecutor(max_workers=self.threads) as executor:
-                future_to_file = {executor.submit(self.get_partial_hash, fp): (fp, s) for fp, s in partial_tasks}
-                completed = 0
-                for future in concurrent.futures.as_completed(future_to_file):
-                    self.pause_event.wait()
-                    if self.stop_event.is_set(): break
-                    fp, s = future_to_file[future]
-                    ph = future.result()
-                    if ph: partial_map[(s, ph)].append(fp)
-                    completed += 1
-                    self.update_progress(completed, len(partial_tasks), f"Pre-screening: {completed}/{len(partial_tasks)}")
-            
-            for (s, ph), paths in partial_map.items():
-                if len(paths) > 1:
-                    for fp in paths: full_tasks.append((fp, s))
-
-        # Phase 2: Full Hashing
-        if full_tasks and not self.stop_event.is_set():
-            self.update_progress(0, len(full_tasks), "Hashing content...")
-            with concurrent.futures.ThreadPoolExecutor(max_workers=self.threads) as executor:
-                future_to_file = {executor.submit(self.get_file_hash, fp): (fp, s) for fp, s in full_tasks}
-                completed = 0
+        def remember(paths, s, h):
+            if self.hash_store:
+                for fp in paths:
+                    for p in (fp, *links.get(fp, ())): self.hash_store.put(p, s, mtimes[fp], h)
+
+        # Each pending group is (size, offset, block, [(path, running hasher)], cached) where cached maps digests
+        # from the hash store to paths. Groups with cached peers are read to EOF so every file gets a full digest.
+        pending = []
+        cached_groups = []
+        total = resolved = 0
+        for s, paths in size_map.items():
+            if len(paths) == 1:
+                if paths[0] in links: report(paths)
+                continue
+            total += len(paths)
+            cached, unknown = defaultdict(list), []
+            for fp in paths:
+                h = self.hash_store.get(fp, s, mtimes[fp]) if self.hash_store else None
+                if h: cached[h].append(fp)
+                else: unknown.append(fp)
+            resolved += len(paths) - len(unknown)
+            if cached: cached_groups.append(cached)
+            if len(unknown) > 1 or (unknown and cached):
+                pending.append((s, 0, 0, [(fp, new_hasher()) for fp in unknown], cached or None))
+        if total: self.update_progress(resolved, total, "Comparing content...")
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.threads) as executor:
+            while pending and not self.stop_event.is_set():
+                # Read the next power-of-two block (2K, 4K, 8K...) from every file still in contention
+                future_to_file = {}
+                for gi, (s, offset, block, members, _) in enumerate(pending):
+                    length = min(BLOCK_START << block, BLOCK_MAX, s - offset)
+                    for fp, hasher in members:
+                        if block == 0: future = executor.submit(self.get_head_key, fp, length)
+                        else: future = executor.submit(self.get_file_hash, fp, hasher, offset, length)
+                        future_to_file[future] = (gi, fp, hasher, length)
+                
+                splits = defaultdict(list)
                 for future in concurrent.futures.as_completed(future_to_file):
-                    self.pause_event.wait()
+                    if not self.pause_event.is_set(): self.pause_event.wait()
                     if self.stop_event.is_set(): break
-                    fp, s = future_to_file[future]
-                    h = future.result()
-                    if h: processed_groups[s][h].append(fp)
-                    completed += 1
-                    self.update_progress(completed, len(full_tasks), f"Hashing: {completed}/{len(full_tasks)}")
-
-        for size, hash_group in processed_groups.items():
-            for h, file_list in hash_group.items():
-                if len(file_list) > 1: self.handle_duplicates(file_list)
-        
+                    gi, fp, hasher, length = future_to_file[future]
+                    res = future.result()
+                    if res is None: resolved += 1; continue
+                    if isinstance(res, tuple): # Head block: split on the 64-bit screen, carry the bytes into the running hash
+                        res, data = res
+                        hasher.update(data)
+                    splits[(gi, res, length)].append((fp, hasher))
+                
+                # Split groups by key; drop files that became unique, report groups that reached EOF by full digest
+                next_pending = []
+                for (gi, _, length), members in splits.items():
+                    s, offset, block, _, cached = pending[gi]
+                    if offset + length >= s:
+                        resolved += len(members)
+                        by_digest = defaultdict(list)
+                        for fp, hasher in members: by_digest[hasher.digest()].append(fp)
+                        for h, paths in by_digest.items():
+                            remember(paths, s, h)
+                            report((cached.pop(h, []) if cached else []) + paths)
+                    elif len(members) < 2 and not cached:
+                        resolved += 1
+                        report([fp for fp, _ in members])
+                    else: next_pending.append((s, offset + length, block + 1, members, cached))
+                pending = next_pending
+                self.update_progress(resolved, total, f"Comparing: {resolved}/{total}")
+        
+        # Whatever is left in the cached maps never matched a freshly hashed file
+        for cached in cached_groups:
+            for paths in cached.values(): report(paths)
+        if self.hash_store: self.hash_store.flush()
+        self.found_groups.sort(key=lambda g: str(g[0])) # Stable review order from run to run
         self.log("Audit Complete.")
 
     def handle_duplicates(self, file_list):
@@ -274,145 +783,244 @@ class FileAuditor:
             self.log(f"  {'Deleted' if self.delete else 'Moved'}: {dupe.name}")
 
 class VideoFileAuditor(FileAuditor):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, fingerprint_store=None, **kwargs):
         super().__init__(*args, **kwargs)
-        self.valid_extensions = {'.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.jpg', '.jpeg', '.png', '.bmp'}
+        self.valid_extensions = VIDEO_EXTS | STILL_EXTS
+        self.fingerprint_store = fingerprint_store
         self.hash_cache = {}
 
-    def get_fingerprint(self, filepath):
-        try:
-            if filepath.suffix.lower() in {'.jpg', '.jpeg', '.png', '.bmp'}:
-                self.pause_event.wait()
-                with Image.open(filepath) as img: return (imagehash.phash(img),)
-            
-            cap = cv2.VideoCapture(str(filepath))
-            if not cap.isOpened(): return None
-            count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            if count < 10: return None
-            hashes = []
-            for p in [0.1, 0.5, 0.9]:
-                self.pause_event.wait()
-                cap.set(cv2.CAP_PROP_POS_FRAMES, int(count * p))
-                ret, frame = cap.read()
-                if ret: hashes.append(imagehash.phash(Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))))
-            cap.release()
-            return tuple(hashes) if len(hashes) == 3 else None
-        except Exception: return None # Broad exception is okay here as many things can fail in video processing
+    def _lookup(self, filepath):
+        # (stat, stored fingerprint or None); a stored fingerprint replaces decoding the file
+        try: st = filepath.stat()
+        except OSError: return None, None
+        return st, (self.fingerprint_store.get(filepath, st.st_size, st.st_mtime_ns) if self.fingerprint_store else None)
+
+    def _fingerprint_stills_gpu(self, paths, batch_size=5000):
+        # Stills are decoded and shrunk on CPU threads; the DCT, median and bit packing for each batch of 5000 run on the
+        # GPU and only 8 bytes per image come back
+        results, todo = [], []
+        for fp in paths:
+            st, cached = self._lookup(fp)
+            if cached: results.append((cached, fp))
+            elif st: todo.append((fp, st))
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.threads) as executor:
+            for start in range(0, len(todo), batch_size):
+                if not self.pause_event.is_set(): self.pause_event.wait()
+                if self.stop_event.is_set(): break
+                batch = [(item, small) for item, small in zip(todo[start:start + batch_size], executor.map(load_still_small, [fp for fp, _ in todo[start:start + batch_size]]))
+                         if small is not None]
+                if batch:
+                    hashes = cp.asnumpy(phash_small(cp.asarray(np.stack([small for _, small in batch])), xp=cp))
+                    for ((fp, st), _), h in zip(batch, hashes):
+                        res = (int(h),)
+                        results.append((res, fp))
+                        if self.fingerprint_store: self.fingerprint_store.put(fp, st.st_size, st.st_mtime_ns, res)
+                done = min(start + batch_size, len(todo))
+                self.update_progress(done, len(todo), f"Hashing images on GPU: {done}/{len(todo)}")
+        return results
 
     def run(self):
         self.log(f"--- Starting Visual/Video Audit ---")
         files = []
-        for dirpath, dirnames, filenames in os.walk(self.root_path):
-            self.pause_event.wait()
+        exclude = {str(self.move_to)} if self.move_to else ()
+        for entry in _walk_concurrent(self.root_path, self.ignore_folders, self.ignore_exts, exclude, self.threads, self.ignore_folder_re):
+            if not self.pause_event.is_set(): self.pause_event.wait()
             if self.stop_event.is_set(): break
-            dirnames[:] = [d for d in dirnames if d.lower() not in self.ignore_folders]
-            if self.move_to and self.move_to in Path(dirpath).parents: continue
-            for f in filenames:
-                fp = Path(dirpath) / f
-                if fp.suffix.lower() in self.valid_extensions: files.append(fp)
+            name = entry.name; dot = name.rfind('.')
+            if dot >= 0 and name[dot:].lower() in self.valid_extensions: files.append(Path(entry.path))
         
         self.log(f"Found {len(files)} media files.")
         fingerprints = []
         
-        if files:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=self.threads) as executor:
-                future_to_file = {executor.submit(self.get_fingerprint, fp): fp for fp in files}
-                completed = 0
-                for future in concurrent.futures.as_completed(future_to_file):
-                    self.pause_event.wait()
-                    if self.stop_event.is_set(): break
-                    fp = future_to_file[future]
-                    res = future.result()
-                    if res: 
-                        fingerprints.append((res, fp))
-                        # Cache first frame hash for UI search
-                        self.hash_cache[fp] = res[0]
-                    completed += 1
-                    self.update_progress(completed, len(files), f"Analyzing: {completed}/{len(files)}")
-
-        # Clustering (Simplified O(N^2) for brevity, BK-Tree preferred for production)
+        if HAS_CUPY and not self.stop_event.is_set():
+            stills = [fp for fp in files if fp.suffix.lower() in STILL_EXTS]
+            files = [fp for fp in files if fp.suffix.lower() not in STILL_EXTS]
+            for res, fp in self._fingerprint_stills_gpu(stills):
+                fingerprints.append((res, fp))
+                self.hash_cache[fp] = res[0]
+        
+        # Decoding and hashing are CPU-bound, so they run in worker processes (spawned, so the UI's threads are never
+        # forked) unless there are too few files to pay for starting them. Store lookups and writes stay in this
+        # process. Only threads*4 files are in flight at a time so pause and stop take effect promptly.
+        todo, completed = [], 0
+        for fp in files:
+            st, cached = self._lookup(fp)
+            if cached: fingerprints.append((cached, fp)); self.hash_cache[fp] = cached[0]; completed += 1
+            elif st: todo.append((fp, st))
+        
+        if todo and not self.stop_event.is_set():
+            if len(todo) >= PROCESS_POOL_MIN:
+                executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.threads, mp_context=multiprocessing.get_context('spawn'),
+                                                                  initializer=_fingerprint_worker_init)
+            else: executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.threads)
+            with executor:
+                queued, in_flight = iter(todo), {}
+                def submit_next():
+                    if (item := next(queued, None)): in_flight[executor.submit(compute_fingerprint, str(item[0]))] = item
+                for _ in range(self.threads * 4): submit_next()
+                while in_flight and not self.stop_event.is_set():
+                    done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        fp, st = in_flight.pop(future)
+                        try: res = future.result()
+                        except Exception: res = None # A crashed worker loses only its file
+                        if res:
+                            fingerprints.append((res, fp))
+                            # Cache first frame hash for UI search
+                            self.hash_cache[fp] = res[0]
+                            if self.fingerprint_store: self.fingerprint_store.put(fp, st.st_size, st.st_mtime_ns, res)
+                        completed += 1
+                        self.update_progress(completed, len(files), f"Analyzing: {completed}/{len(files)}")
+                        if not self.pause_event.is_set(): self.pause_event.wait()
+                        if not self.stop_event.is_set(): submit_next()
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        # Clustering: with Numba the candidate scan is a compiled parallel kernel; otherwise fingerprints are indexed in a
+        # BK-tree so each seed only visits nearby branches.
+        # Still images (1 hash) and videos (3 hashes) are clustered separately since their fingerprints aren't comparable.
         self.log("Clustering...")
         fingerprints.sort(key=lambda x: str(x[1]))
-        visited = set()
         threshold = self.threshold
         
-        for i in range(len(fingerprints)):
-            self.pause_event.wait()
-            if self.stop_event.is_set(): break
-            p_fp, p_path = fingerprints[i]
-            if p_path in visited: continue
-            group = [p_path]
-            visited.add(p_path)
-            
-            for j in range(i+1, len(fingerprints)):
-                c_fp, c_path = fingerprints[j]
-                if c_path in visited: continue
-                dist = sum(p_fp[k] - c_fp[k] for k in range(len(p_fp)))
-                if dist <= threshold:
-                    group.append(c_path)
-                    visited.add(c_path)
-            
-            if len(group) > 1: self.handle_duplicates(group)
+        for n_hashes in sorted({len(fp) for fp, _ in fingerprints}):
+            subset = [p for fp, p in fingerprints if len(fp) == n_hashes]
+            keys = [fp for fp, _ in fingerprints if len(fp) == n_hashes]
+            if HAS_NUMBA:
+                arr = np.array(keys, dtype=np.uint64)
+                labels = np.full(len(subset), -1, dtype=np.int64)
+                for start in range(0, len(subset), CLUSTER_CHUNK):
+                    if not self.pause_event.is_set(): self.pause_event.wait()
+                    if self.stop_event.is_set(): break
+                    _cluster_greedy(arr, threshold, labels, start, min(start + CLUSTER_CHUNK, len(subset)))
+                    self.update_progress(start, len(subset), f"Clustering: {start}/{len(subset)}")
+                if self.stop_event.is_set(): break # Partial labels would report unfinished groups
+                groups = defaultdict(list)
+                for p, seed in zip(subset, labels): groups[seed].append(p)
+                for group in groups.values():
+                    if len(group) > 1: self.handle_duplicates(group)
+                continue
+            tree = BKTree()
+            for i, key in enumerate(keys): tree.add(key, i)
+            visited = [False] * len(subset)
+            for i in range(len(subset)):
+                if not self.pause_event.is_set(): self.pause_event.wait()
+                if self.stop_event.is_set(): break
+                if visited[i]: continue
+                visited[i] = True
+                matches = sorted(j for j, _ in tree.search(keys[i], threshold) if not visited[j])
+                for j in matches: visited[j] = True
+                if matches: self.handle_duplicates([subset[i]] + [subset[j] for j in matches])
         self.log("Audit Complete.")
 
 class FolderMerger:
     def __init__(self, master_root, incoming_root, mode="copy", dupe_action="ignore", 
-                 log_callback=None, progress_callback=None, stop_event=None, threads=4, dry_run=False):
+                 log_callback=None, progress_callback=None, stop_event=None, threads=4, dry_run=False, hash_store=None):
         self.master_root = Path(master_root).resolve()
         self.incoming_root = Path(incoming_root).resolve()
         self.mode = mode; self.dupe_action = dupe_action; self.dry_run = dry_run
+        self.threads = threads
+        self.hash_store = hash_store
         self.log = log_callback if log_callback else print
         self.update_progress = progress_callback if progress_callback else lambda x, y, z: None
         self.stop_event = stop_event if stop_event else threading.Event()
         self.quarantine_path = self.incoming_root.parent / f"{self.incoming_root.name}_duplicates"
         self.stats = {"merged": 0, "duplicates": 0, "renamed": 0, "errors": 0}
         self.simulated_paths = set()
+        self._master_hash_cache = {}
+        self._master_partial_cache = {}
 
     def run(self):
         self.log(f"--- Merge Started ({'DRY' if self.dry_run else 'LIVE'}) ---")
-        master_index = defaultdict(list)
-        for r, _, fs in os.walk(self.master_root):
-            for f in fs:
-                try: master_index[Path(r).joinpath(f).stat().st_size].append(Path(r).joinpath(f))
-                except: pass
+        self._master_hash_cache = {}
+        self._master_partial_cache = {}
+        # The master index lives in a private temporary SQLite database (kept in memory, spilled to disk when large)
+        # rather than a dict of Path objects. Both sides reuse the DirEntry stat so no file is stat-ed twice.
+        index = sqlite3.connect("")
+        index.execute("CREATE TABLE master (size INTEGER, dev INTEGER, ino INTEGER, mtime_ns INTEGER, path BLOB)")
+        rows = []
+        for entry in _walk_concurrent(self.master_root, threads=self.threads, prestat=True):
+            try: st = entry.stat()
+            except OSError: continue
+            rows.append((st.st_size, st.st_dev, st.st_ino, st.st_mtime_ns, os.fsencode(entry.path)))
+            if len(rows) >= 10000: index.executemany("INSERT INTO master VALUES (?, ?, ?, ?, ?)", rows); rows.clear()
+        index.executemany("INSERT INTO master VALUES (?, ?, ?, ?, ?)", rows)
+        index.execute("CREATE INDEX idx_size ON master(size)")
         
         incoming = []
         total_bytes = 0
-        for r, _, fs in os.walk(self.incoming_root):
-            if self.quarantine_path in Path(r).parents: continue
-            for f in fs:
-                p = Path(r) / f
-                incoming.append(p)
-                try: total_bytes += p.stat().st_size
-                except: pass
+        for entry in _walk_concurrent(self.incoming_root, exclude={str(self.quarantine_path)}, threads=self.threads, prestat=True):
+            try: st = entry.stat()
+            except OSError: st = None
+            incoming.append((entry.path, st))
+            if st: total_bytes += st.st_size
         
         processed_bytes = 0
-        for i, inc in enumerate(incoming):
+        for i, (inc, st) in enumerate(incoming):
             if self.stop_event.is_set(): break
-            try: sz = inc.stat().st_size
-            except: sz = 0
+            sz = st.st_size if st else 0
             
             is_dupe = False
-            if sz in master_index:
-                h1 = self._hash(inc)
-                for cand in master_index[sz]:
-                    if h1 == self._hash(cand): is_dupe = True; break
+            candidates = index.execute("SELECT dev, ino, mtime_ns, path FROM master WHERE size=?", (sz,)).fetchall() if st else []
+            if candidates:
+                # A hardlink (same device + inode) into the master tree is a duplicate without reading either file
+                if st.st_ino:
+                    is_dupe = any((dev, ino) == (st.st_dev, st.st_ino) for dev, ino, _, _ in candidates)
+                if not is_dupe:
+                    # Candidates are screened on their first PARTIAL_HASH_SIZE bytes; the incoming file is fully hashed
+                    # (once, however many candidates survive) only when a head matches
+                    p1, h1 = self._partial_hash(inc, sz), None
+                    for _, _, mtime_ns, path in candidates:
+                        if p1 is None or p1 != self._partial_master(path, sz): continue
+                        if sz <= PARTIAL_HASH_SIZE: is_dupe = True; break # The head was the whole file
+                        if h1 is None and (h1 := self._hash(inc, sz, st.st_mtime_ns)) is None: break
+                        if h1 == self._hash_master(path, sz, mtime_ns): is_dupe = True; break
             
-            if is_dupe: self._handle_dupe(inc)
-            else: self._merge(inc)
+            if is_dupe: self._handle_dupe(Path(inc))
+            else: self._merge(Path(inc))
             
             processed_bytes += sz
             if i % 5 == 0: self.update_progress(processed_bytes, total_bytes, f"Processing: {i}/{len(incoming)}")
+        index.close()
+        if self.hash_store: self.hash_store.flush()
         self.log("Merge Complete.")
 
-    def _hash(self, p):
+    def _hash_master(self, path, size, mtime_ns):
+        # Master files don't change during a merge, so each is hashed at most once per run however many incoming
+        # files collide with its size
+        h = self._master_hash_cache.get(path)
+        if h is None:
+            h = self._master_hash_cache[path] = self._hash(os.fsdecode(path), size, mtime_ns)
+        return h
+
+    def _partial_master(self, path, size):
+        p = self._master_partial_cache.get(path)
+        if p is None: p = self._master_partial_cache[path] = self._partial_hash(os.fsdecode(path), size)
+        return p
+
+    def _partial_hash(self, p, size, n=None):
+        # Key of the first n bytes: a quick 64-bit screen, or the full digest when the file fits in n so that a match
+        # is final
+        n = n or PARTIAL_HASH_SIZE
+        data = read_head(p, n)
+        if data is None: return None
+        if size > n: return quick_key(data)
+        h = new_hasher(); h.update(data)
+        return h.digest()
+
+    def _hash(self, p, size, mtime_ns):
         try:
-            h = hashlib.sha256()
-            with open(p, 'rb') as f:
-                while c := f.read(65536): 
-                    if self.stop_event.is_set(): return None
-                    h.update(c)
-            return h.hexdigest()
+            if self.hash_store and (d := self.hash_store.get(p, size, mtime_ns)): return d
+            if HAS_BLAKE3 and size >= MMAP_HASH_MIN: d = hash_large_file(p)
+            else:
+                h = new_hasher()
+                with open(p, 'rb') as f:
+                    while c := f.read(65536): 
+                        if self.stop_event.is_set(): return None
+                        h.update(c)
+                d = h.digest()
+            if self.hash_store: self.hash_store.put(p, size, mtime_ns, d)
+            return d
         except: return None
 
     def _handle_dupe(self, p):
@@ -443,7 +1051,7 @@ class FolderMerger:
 # ==========================================
 
 class ReviewDialog:
-    def __init__(self, parent, duplicate_groups, move_to_path=None, precomputed_hashes=None, threshold=5):
+    def __init__(self, parent, duplicate_groups, move_to_path=None, precomputed_hashes=None, threshold=5, log_callback=None):
         self.top = ctk.CTkToplevel(parent)
         self.top.title("Review Duplicates")
         self._center_window(1100, 650)
@@ -451,16 +1059,28 @@ class ReviewDialog:
         # Ensure the dialog opens on top and is modal
         self.top.transient(parent)
         self.top.grab_set()
+        self.top.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._closed = False
 
+        self.log = log_callback if log_callback else print
         self.groups = duplicate_groups
         self.move_to_path = move_to_path
         self.hash_cache = precomputed_hashes if precomputed_hashes else {}
+        self._hash_paths, self._hash_arr = [], None
         self.threshold = threshold
         self.undo_stack = []
         self.temp_dir = Path(tempfile.mkdtemp(prefix="dedup_staging_"))
-        self.preview_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
-        self.thumbnail_cache = {}
+        self.temp_dev = self.temp_dir.stat().st_dev
+        self.staging_dirs = {} # st_dev -> staging folder on that filesystem
+        self._staging_locks = [] # Open .owner files of our mount-point staging folders; see _staging_dir_for
+        self.preview_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4) # Room for prefetch next to the two foreground loads
+        self.io_executor = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+        self.thumbnail_cache = OrderedDict() # path -> (CTkImage, bytes), least recently shown first
+        self.thumbnail_bytes = 0
+        self.thumb_store = ThumbnailCache()
+        self.preview_executor.submit(self.thumb_store.prune)
         self.active_futures = {}
+        self.prefetch_futures = {}
         self.latest_requests = {}
         self.icons = IconFactory.create_icons()
         
@@ -470,17 +1090,29 @@ class ReviewDialog:
             base_path = Path(__file__).parent
         self.targets_file = base_path / "move_targets.json"
         self.move_targets = self._load_targets()
+        self._targets_set = set(self.move_targets) # O(1) membership next to the ordered list shown in the combobox
+        self._targets_dirty = self._flush_scheduled = False
+        
+        # Every file is stat-ed once up front; sorting, size labels and smart select read this memo, and moves drop
+        # the entries they invalidate
+        self.stat_cache = {}
+        for p in {f for g in self.groups for f in g}:
+            try: self.stat_cache[p] = p.stat()
+            except OSError: pass
         
         self.all_pairs = []
         self.extensions = set()
         for group in self.groups:
             try:
-                group.sort(key=lambda x: (-x.stat().st_size, x.stat().st_ctime))
-                pair = (group[0], group[1])
+                # Only the two best-ranked files (largest, then oldest) form the pair, so rank (-size, ctime, index)
+                # rows built from the stat memo and take the top two instead of sorting the whole group
+                ranked = [(-self.stat_cache[p].st_size, self.stat_cache[p].st_ctime, i) for i, p in enumerate(group)]
+                (_, _, first), (_, _, second) = heapq.nsmallest(2, ranked)
+                pair = (group[first], group[second])
                 self.all_pairs.append(pair)
                 self.extensions.add(pair[1].suffix.lower())
             except: continue
-        self.pairs = self.all_pairs[:]
+        self._set_pairs(self.all_pairs[:])
         self.current_index = 0
         self._init_ui()
         self._load_pair()
@@ -493,17 +1125,42 @@ class ReviewDialog:
         self.top.geometry(f'{width}x{height}+{x}+{y}')
 
     def _load_targets(self):
-        if self.targets_file.exists():
-            try: return json.loads(self.targets_file.read_text())
-            except: return []
-        return []
+        # One read; a missing file is just the exception path rather than a separate exists() call
+        try: return json_loads(self.targets_file.read_bytes())
+        except: return []
 
     def _save_target(self, target):
-        if target not in self.move_targets:
+        # The list updates immediately; the file write is debounced by 500 ms and happens once per burst of changes
+        if target not in self._targets_set:
+            self._targets_set.add(target)
             self.move_targets.append(target)
             self.cb_targets['values'] = self.move_targets
-            try: self.targets_file.write_text(json.dumps(self.move_targets))
-            except: pass
+            self._targets_dirty = True
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                self.top.after(500, self._flush_targets)
+
+    def _flush_targets(self):
+        self._flush_scheduled = False
+        if not self._targets_dirty: return
+        self._targets_dirty = False
+        try:
+            tmp = self.targets_file.with_suffix('.tmp')
+            tmp.write_text(json.dumps(self.move_targets))
+            os.replace(tmp, self.targets_file)
+        except: pass
+
+    def _on_close(self):
+        # Staged deletes are only kept for undo, which ends with the dialog. Also called by DedupApp.on_close when the
+        # main window goes first, so a second call is a no-op.
+        if self._closed: return
+        self._closed = True
+        self._flush_targets()
+        self.preview_executor.shutdown(wait=False, cancel_futures=True)
+        self.io_executor.shutdown(wait=True)
+        for f in self._staging_locks: f.close() # Windows won't unlink a file that is still open
+        for d in {self.temp_dir, *self.staging_dirs.values()}: purge_dir(d)
+        self.top.destroy()
 
     def _init_ui(self):
         # Top Filter & Status
@@ -592,14 +1249,15 @@ class ReviewDialog:
     def apply_filter(self):
         ext = self.filter_var.get().strip()
         if not ext: return
-        self.pairs = [p for p in self.all_pairs if p[1].suffix.lower() == ext.lower()]
+        ext = ext.lower()
+        self._set_pairs([p for p in self.all_pairs if p[1].suffix.lower() == ext])
         self.current_index = 0
         self._load_pair()
 
     def clear_filter(self):
         self.filter_var.set("")
         self.cb_filter.set("")
-        self.pairs = self.all_pairs[:]
+        self._set_pairs(self.all_pairs[:])
         self.current_index = 0
         self._load_pair()
 
@@ -607,23 +1265,17 @@ class ReviewDialog:
         if not self.pairs: return
         if not messagebox.askyesno("Delete All", f"Are you sure you want to delete all {len(self.pairs)} duplicates currently listed?"): return
         
-        operations = []
         restore_index = self.current_index
-        count = 0
-        for i, (orig, dupe) in enumerate(self.pairs):
-            if not dupe.exists(): continue
-            try:
-                tmp = self.temp_dir / f"{uuid.uuid4()}_{dupe.name}"
-                shutil.move(str(dupe), str(tmp))
-                operations.append((tmp, dupe))
-                count += 1
-            except Exception as e: print(f"Error deleting {dupe}: {e}")
+        jobs = [(dupe, self._staging_dir_for(dupe) / f"{uuid.uuid4()}_{dupe.name}") for orig, dupe in self.pairs]
+        operations, failures = self._run_bulk(jobs, "Deleting")
+        count = len(operations)
         
         if operations:
+            self._forget_stats(operations)
             self.undo_stack.append((operations, restore_index))
         self.current_index = len(self.pairs)
         self._load_pair()
-        messagebox.showinfo("Success", f"Deleted {count} files.")
+        self._report_bulk("Delete All", f"Deleted {count} files.", failures)
 
     def move_all_shown(self):
         if not self.pairs: return
@@ -637,24 +1289,54 @@ class ReviewDialog:
 
         target_path = Path(target_dir)
         self._save_target(target_dir)
-        operations = []
         restore_index = self.current_index
-        count = 0
+        # Destinations are all chosen up front so the moves can run in parallel. The target folder is listed once and
+        # names claimed by this batch join that set, instead of an exists() per file.
+        try:
+            with os.scandir(target_path) as it: taken = {e.name.casefold() for e in it} # Casefolded: targets may be case-insensitive
+        except OSError: taken = set()
+        jobs = []
         for i, (orig, dupe) in enumerate(self.pairs):
-            if not dupe.exists(): continue
-            try:
-                dest_file = target_path / dupe.name
-                if dest_file.exists(): dest_file = target_path / f"{dupe.stem}_{int(time.time())}_{i}{dupe.suffix}"
-                shutil.move(str(dupe), str(dest_file))
-                operations.append((dest_file, dupe))
-                count += 1
-            except Exception as e: print(f"Error moving {dupe}: {e}")
+            name = dupe.name
+            if name.casefold() in taken: name = f"{dupe.stem}_{i}{dupe.suffix}"
+            while name.casefold() in taken: name = f"{dupe.stem}_{i}_{uuid.uuid4().hex[:8]}{dupe.suffix}"
+            taken.add(name.casefold())
+            jobs.append((dupe, target_path / name))
+        operations, failures = self._run_bulk(jobs, "Moving")
+        count = len(operations)
         
         if operations:
+            self._forget_stats(operations)
             self.undo_stack.append((operations, restore_index))
         self.current_index = len(self.pairs)
         self._load_pair()
-        messagebox.showinfo("Success", f"Moved {count} files to {target_dir}.")
+        self._report_bulk("Move All", f"Moved {count} files to {target_dir}.", failures)
+
+    def _run_bulk(self, jobs, verb):
+        # (src, dst) moves run on the I/O pool so per-file metadata round trips on slow or network storage overlap.
+        # Returns the completed ones as undo operations (dst, src), plus "path: error" lines for the ones that failed.
+        futures = {self.io_executor.submit(fast_move, src, dst): (src, dst) for src, dst in jobs}
+        operations, failures = [], []
+        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            src, dst = futures[future]
+            # No exists() pre-check per file: a source that is already gone just fails its rename. Any other missing
+            # path (target folder or staging dir removed, volume unmounted) is a real error.
+            try:
+                future.result()
+                operations.append((dst, src))
+            except Exception as e:
+                if not (isinstance(e, FileNotFoundError) and not os.path.lexists(src)): failures.append(f"{src}: {e}")
+            if done % 25 == 0 or done == len(futures):
+                self.lbl_stats.configure(text=f"{verb}: {done}/{len(futures)}")
+                self.top.update_idletasks()
+        return operations, failures
+
+    def _report_bulk(self, title, summary, failures):
+        # Failures are shown, not printed: under pythonw or the frozen build there is no console to print to
+        if not failures: messagebox.showinfo(title, summary); return
+        shown = "\n".join(failures[:10]) + (f"\n... and {len(failures) - 10} more" if len(failures) > 10 else "")
+        self.lbl_stats.configure(text=f"{len(failures)} failed")
+        messagebox.showwarning(title, f"{summary}\n\n{len(failures)} failed:\n{shown}")
 
     def _load_pair(self):
         if self.current_index >= len(self.pairs):
@@ -674,64 +1356,165 @@ class ReviewDialog:
         
         self._show_img(self.lbl_orig, self.orig)
         self._show_img(self.lbl_dupe, self.dupe)
+        self._prefetch_around()
+
+    def _staging_dir_for(self, path):
+        # Deleted files are staged on their own filesystem when possible (a folder at its mount point), so a delete
+        # and its undo are renames rather than copies. Falls back to the temp staging folder.
+        st = self._stat(path)
+        if st is None or st.st_dev == self.temp_dev: return self.temp_dir
+        d = self.staging_dirs.get(st.st_dev)
+        if d is None:
+            d = self.temp_dir
+            mount = path.parent
+            try:
+                while mount.parent != mount and mount.parent.stat().st_dev == st.st_dev: mount = mount.parent
+                self._sweep_stale_staging(mount)
+                d = Path(tempfile.mkdtemp(prefix=".dedup_staging_", dir=mount))
+                try: lock = lock_owner(d)
+                except OSError: lock = None
+                if lock: self._staging_locks.append(lock)
+                self.log(f"Deleted files from {mount} are staged in {d} until the review window closes.")
+            except OSError as e:
+                self.log(f"Cannot stage deletes on {mount} ({e}); they are copied to {self.temp_dir} instead.")
+            self.staging_dirs[st.st_dev] = d
+        return d
+
+    def _sweep_stale_staging(self, mount):
+        # Staging folders left behind by a crashed or killed session still hold "deleted" files. A folder whose .owner
+        # lock can be taken has no live owner and is purged.
+        try:
+            with os.scandir(mount) as it: stale = [e.path for e in it if e.name.startswith(".dedup_staging_") and e.is_dir(follow_symlinks=False)]
+        except OSError: return
+        for folder in stale:
+            try: lock = lock_owner(folder)
+            except OSError: continue
+            if lock is None: continue # Owned by another running session
+            lock.close(); purge_dir(folder)
+            self.log(f"Removed leftover staging folder {folder}.")
+
+    def _stat(self, path):
+        st = self.stat_cache.get(path)
+        if st is None:
+            try: st = self.stat_cache[path] = path.stat()
+            except OSError: return None
+        return st
+
+    def _forget_stats(self, operations):
+        for src, dest in operations:
+            self.stat_cache.pop(src, None); self.stat_cache.pop(dest, None)
 
     def _fmt_size(self, path):
         try:
-            s = path.stat().st_size
+            s = self._stat(path).st_size
             for u in ['B','KB','MB','GB']:
                 if s < 1024: return f"{s:.2f} {u}"
                 s /= 1024
             return f"{s:.2f} TB"
         except: return "Unknown"
 
+    def _decode_preview(self, path, wanted=lambda: True):
+        # Worker-thread half of a preview: (raw bytes, size, mode) of a <=400px thumbnail, or None. `wanted` lets a
+        # foreground load bail out once the UI has moved on.
+        # EARLY EXIT: If UI has moved on to a different image, abort immediately
+        if not wanted(): return None
+
+        try:
+            path_str = str(path) # Converted once for the cache key and the decoder
+            # A thumbnail stored by an earlier visit (this run or a previous one) skips decoding the file
+            st = self._stat(path)
+            if st is None: return None
+            img = self.thumb_store.get(path_str, st)
+            if img is not None: return (img.tobytes(), img.size, img.mode)
+            
+            if path.suffix.lower() in VIDEO_EXTS:
+                cap = open_capture(path_str)
+                try:
+                    if not cap.isOpened(): return None
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, int(cap.get(cv2.CAP_PROP_FRAME_COUNT) * 0.5))
+                    ret, frame = cap.read()
+                finally: cap.release()
+                if not ret: return None
+                # Shrunk in OpenCV before the color conversion so a 4K frame is never copied at full size
+                h, w = frame.shape[:2]
+                if max(h, w) > 400:
+                    scale = 400 / max(h, w)
+                    frame = cv2.resize(frame, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+                img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                del frame
+            else:
+                img = Image.open(path_str)
+                # JPEGs are scaled by 1/2..1/8 inside libjpeg's IDCT, so a large photo is never fully decoded
+                if img.format == 'JPEG': img.draft('RGB', (400, 400))
+                img.load()
+            
+            # SECOND EXIT: Check again before heavy processing (resizing)
+            if not wanted(): return None
+
+            # Shrink first so the colorspace conversion only touches preview-sized data. Palette and 1-bit images are
+            # converted up front because PIL can only resize them with nearest-neighbour.
+            if img.mode in ('P', '1'): img = img.convert('RGB')
+            img.thumbnail((400, 400), Image.Resampling.BILINEAR if hasattr(Image, 'Resampling') else Image.BILINEAR)
+            # Convert to RGB to ensure compatibility with ImageTk
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGB')
+            self.thumb_store.put(path_str, st, img)
+            # Return raw data to prevent cross-thread object issues
+            return (img.tobytes(), img.size, img.mode)
+        except Exception as e:
+            print(f"Error loading preview for {path}: {e}")
+            return None
+
+    def _thumbnail_from_result(self, path, result):
+        # Recreate image in main thread; CTkImage needs its size for display
+        raw_data, size, mode = result
+        img = Image.frombytes(mode, size, raw_data)
+        ctk_img = ctk.CTkImage(light_image=img, dark_image=img, size=size)
+        self._cache_thumbnail(path, ctk_img, size[0] * size[1] * 4)
+        return ctk_img
+
+    def _prefetch_around(self):
+        # Speculatively decode the next two pairs and the previous one so stepping through the list finds them cached
+        for offset in (1, 2, -1):
+            idx = self.current_index + offset
+            if not 0 <= idx < len(self.pairs): continue
+            for path in self.pairs[idx]:
+                if path in self.thumbnail_cache or path in self.prefetch_futures: continue
+                future = self.preview_executor.submit(self._decode_preview, path)
+                self.prefetch_futures[path] = future
+                future.add_done_callback(lambda f, p=path: self.top.after(0, self._on_prefetched, p, f))
+
+    def _on_prefetched(self, path, future):
+        # A foreground load that adopted this future (popped it) gets the result through its own callback instead
+        if self.prefetch_futures.get(path) is not future: return
+        del self.prefetch_futures[path]
+        try:
+            if (result := future.result()): self._thumbnail_from_result(path, result)
+        except Exception: pass
+
     def _show_img(self, lbl, path):
         # 1. Check Cache
         if path in self.thumbnail_cache:
-            ctk_img = self.thumbnail_cache[path]
+            self.thumbnail_cache.move_to_end(path)
+            ctk_img = self.thumbnail_cache[path][0]
             lbl.configure(image=ctk_img, text="")
             lbl.image = ctk_img
             return
 
+        # Same path already loading for this label (re-clicks, redraws): keep the in-flight load
+        active = self.active_futures.get(lbl)
+        if active is not None and self.latest_requests.get(lbl) == path and not active.done(): return
+
         # Update the latest requested path for this label
         self.latest_requests[lbl] = path
 
-        # 2. Cancel pending future for this label to prevent queue flooding
-        if lbl in self.active_futures:
-            self.active_futures[lbl].cancel()
+        # 2. Cancel pending future for this label to prevent queue flooding (a running one can't be cancelled)
+        if active is not None:
+            if not active.running(): active.cancel()
             del self.active_futures[lbl]
 
         lbl.configure(image=None, text="Loading...")
         
-        def load_task():
-            # EARLY EXIT: If UI has moved on to a different image, abort immediately
-            if self.latest_requests.get(lbl) != path: return None
-
-            try:
-                if path.suffix.lower() in {'.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v'}:
-                    cap = cv2.VideoCapture(str(path))
-                    if not cap.isOpened(): return None
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, int(cap.get(cv2.CAP_PROP_FRAME_COUNT) * 0.5))
-                    ret, frame = cap.read()
-                    cap.release()
-                    if not ret: return None
-                    img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-                else:
-                    img = Image.open(str(path))
-                    img.load()
-                
-                # SECOND EXIT: Check again before heavy processing (resizing)
-                if self.latest_requests.get(lbl) != path: return None
-
-                # Convert to RGB to ensure compatibility with ImageTk
-                if img.mode not in ('RGB', 'RGBA'):
-                    img = img.convert('RGB')
-                img.thumbnail((400, 400))
-                # Return raw data to prevent cross-thread object issues
-                return (img.tobytes(), img.size, img.mode)
-            except Exception as e:
-                print(f"Error loading preview for {path}: {e}")
-                return None
-
         def on_loaded(future):
             # Clean up future reference
             if lbl in self.active_futures:
@@ -744,17 +1527,7 @@ class ReviewDialog:
             try:
                 result = future.result()
                 if result:
-                    raw_data, size, mode = result
-                    # Recreate image in main thread
-                    img = Image.frombytes(mode, size, raw_data)
-
-                    # Create CTkImage. Size is required for display.
-                    ctk_img = ctk.CTkImage(light_image=img, dark_image=img, size=size)
-                    
-                    # Cache the result (limit size to avoid memory issues)
-                    if len(self.thumbnail_cache) > 200: self.thumbnail_cache.clear()
-                    self.thumbnail_cache[path] = ctk_img
-                    
+                    ctk_img = self._thumbnail_from_result(path, result)
                     lbl.configure(image=ctk_img, text="")
                     lbl.image = ctk_img
                 else:
@@ -763,15 +1536,27 @@ class ReviewDialog:
                 print(f"Error displaying preview: {e}")
                 lbl.configure(image=None, text="[Display Error]")
 
-        future = self.preview_executor.submit(load_task)
+        # A prefetch already in flight for this path is adopted instead of decoding the file a second time
+        future = self.prefetch_futures.pop(path, None)
+        if future is None: future = self.preview_executor.submit(self._decode_preview, path, lambda: self.latest_requests.get(lbl) == path)
         self.active_futures[lbl] = future
         future.add_done_callback(lambda f: self.top.after(0, on_loaded, f))
 
+    def _cache_thumbnail(self, path, ctk_img, nbytes):
+        # LRU bounded by entry count and by decoded bytes, so a few large previews can't hold on to too much memory
+        old = self.thumbnail_cache.pop(path, None)
+        if old: self.thumbnail_bytes -= old[1]
+        self.thumbnail_cache[path] = (ctk_img, nbytes)
+        self.thumbnail_bytes += nbytes
+        while len(self.thumbnail_cache) > 200 or (self.thumbnail_bytes > THUMB_CACHE_MAX_BYTES and len(self.thumbnail_cache) > 1):
+            self.thumbnail_bytes -= self.thumbnail_cache.popitem(last=False)[1][1]
+
     def delete_dupe(self):
         try:
-            tmp = self.temp_dir / f"{uuid.uuid4()}_{self.dupe.name}"
-            shutil.move(str(self.dupe), str(tmp))
+            tmp = self._staging_dir_for(self.dupe) / f"{uuid.uuid4()}_{self.dupe.name}"
+            fast_move(self.dupe, tmp)
             operations = [(tmp, self.dupe)]
+            self._forget_stats(operations)
             self.undo_stack.append((operations, self.current_index))
             self.next_pair()
         except Exception as e: messagebox.showerror("Error", str(e))
@@ -780,7 +1565,8 @@ class ReviewDialog:
         if self.undo_stack:
             operations, idx = self.undo_stack.pop()
             for src, dest in operations:
-                shutil.move(str(src), str(dest))
+                fast_move(src, dest)
+            self._forget_stats(operations)
             self.current_index = idx
             self._load_pair()
 
@@ -796,19 +1582,27 @@ class ReviewDialog:
         try:
             dest = Path(tgt) / self.dupe.name
             if dest.exists(): dest = Path(tgt) / f"{self.dupe.stem}_{int(time.time())}{self.dupe.suffix}"
-            shutil.move(str(self.dupe), str(dest))
+            fast_move(self.dupe, dest)
             operations = [(dest, self.dupe)]
+            self._forget_stats(operations)
             self._save_target(tgt)
             self.undo_stack.append((operations, self.current_index))
             self.next_pair()
         except Exception as e: messagebox.showerror("Error", str(e))
 
+    def _set_pairs(self, pairs):
+        # pair_sizes[i] = (original size, duplicate size) of pairs[i], -1 where a file couldn't be stat-ed. _stat re-stats
+        # paths that _forget_stats dropped after a delete, move or undo.
+        self.pairs = pairs
+        self.pair_sizes = np.array([[st.st_size if (st := self._stat(p)) else -1 for p in pair] for pair in pairs], dtype=np.int64).reshape(-1, 2)
+
     def smart_select(self):
-        for i in range(self.current_index, len(self.pairs)):
+        # Swap every remaining pair whose duplicate is larger, found with one comparison over the size array
+        tail = self.pair_sizes[self.current_index:]
+        for i in np.flatnonzero((tail[:, 1] > tail[:, 0]) & (tail[:, 0] >= 0)) + self.current_index:
             o, d = self.pairs[i]
-            try:
-                if d.stat().st_size > o.stat().st_size: self.pairs[i] = (d, o)
-            except: pass
+            self.pairs[i] = (d, o)
+            self.pair_sizes[i] = self.pair_sizes[i, ::-1]
         self._load_pair()
         messagebox.showinfo("Info", "Smart select complete")
 
@@ -819,20 +1613,19 @@ class ReviewDialog:
 
         try:
             target_hash = self.hash_cache.get(self.dupe)
-            if not target_hash:
+            if target_hash is None:
                 messagebox.showerror("Error", f"Could not find hash for {self.dupe.name}.", parent=self.top)
                 return
 
-            similar_files = []
-            checked_paths = {self.dupe}
             similarity_threshold = self.threshold if self.threshold > 0 else 5
 
-            for path, h in self.hash_cache.items():
-                if path in checked_paths: continue
-                distance = target_hash - h
-                if 0 < distance <= similarity_threshold:
-                    similar_files.append((path, distance))
-                checked_paths.add(path)
+            # One XOR + popcount over every stored hash at once; the packed array is rebuilt only when the cache grows
+            if len(self._hash_paths) != len(self.hash_cache):
+                self._hash_paths = list(self.hash_cache)
+                self._hash_arr = np.fromiter(self.hash_cache.values(), dtype=np.uint64, count=len(self.hash_cache))
+            dist = popcount_array(self._hash_arr ^ np.uint64(target_hash))
+            similar_files = [(self._hash_paths[i], int(dist[i])) for i in np.flatnonzero((dist > 0) & (dist <= similarity_threshold))
+                             if self._hash_paths[i] != self.dupe]
 
             if not similar_files:
                 messagebox.showinfo("No Similar Found", f"No other files found within a similarity threshold of {similarity_threshold}.", parent=self.top)
@@ -864,26 +1657,44 @@ class ReviewDialog:
     def export_pdf(self):
         f = filedialog.asksaveasfilename(defaultextension=".pdf")
         if f:
-            c = canvas.Canvas(f, pagesize=letter)
-            y = 750
-            for o, d in self.pairs:
-                if y < 100: c.showPage(); y = 750
-                c.drawString(50, y, f"Orig: {o.name}"); c.drawString(300, y, f"Dupe: {d.name}")
-                y -= 20
-            c.save()
-            messagebox.showinfo("Export", "PDF Saved")
+            # One text object per column per page (same 20pt rows from y=750 down to 100) instead of two drawString
+            # calls per pair; generated on the I/O pool
+            names = [(o.name, d.name) for o, d in self.pairs]
+            def write():
+                from reportlab.pdfgen import canvas
+                from reportlab.lib.pagesizes import letter
+                c = canvas.Canvas(f, pagesize=letter)
+                for start in range(0, len(names), PDF_ROWS_PER_PAGE):
+                    if start: c.showPage()
+                    chunk = names[start:start + PDF_ROWS_PER_PAGE]
+                    for x, label, col in ((50, "Orig", 0), (300, "Dupe", 1)):
+                        text = c.beginText(x, 750)
+                        text.setFont("Helvetica", 12); text.setLeading(20)
+                        for row in chunk: text.textLine(f"{label}: {row[col]}")
+                        c.drawText(text)
+                c.save()
+            def done(future):
+                if (e := future.exception()): messagebox.showerror("Error", f"Could not save PDF: {e}", parent=self.top)
+                else: messagebox.showinfo("Export", "PDF Saved", parent=self.top)
+            self.io_executor.submit(write).add_done_callback(lambda fut: self.top.after(0, done, fut))
 
     def export_csv(self):
         f = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")])
         if f:
-            try:
-                with open(f, "w", newline="", encoding="utf-8") as csvfile:
+            # Rows are formatted here from the stat memo (no syscalls); the file is written on the I/O pool in one
+            # writerows call through a 1 MB buffer, and the result is reported back on the Tk thread
+            rows = [(o.name, d.name, self._fmt_size(o), str(o), str(d)) for o, d in self.pairs]
+            def write():
+                with open(f, "w", newline="", encoding="utf-8", buffering=1024 * 1024) as csvfile:
                     writer = csv.writer(csvfile)
                     writer.writerow(["Original", "Duplicate", "Size", "Original Path", "Duplicate Path"])
-                    for o, d in self.pairs:
-                        writer.writerow([o.name, d.name, self._fmt_size(o), str(o), str(d)])
-                messagebox.showinfo("Export", "CSV Saved")
-            except Exception as e: messagebox.showerror("Error", f"Could not save CSV: {e}")
+                    writer.writerows(rows)
+            def done(future):
+                self.lbl_stats.configure(text=f"Showing {len(self.pairs)} pairs")
+                if (e := future.exception()): messagebox.showerror("Error", f"Could not save CSV: {e}", parent=self.top)
+                else: messagebox.showinfo("Export", "CSV Saved", parent=self.top)
+            self.lbl_stats.configure(text=f"Exporting {len(rows)} rows...")
+            self.io_executor.submit(write).add_done_callback(lambda fut: self.top.after(0, done, fut))
 
     def _show_properties(self, path):
         try:
@@ -903,7 +1714,7 @@ class ReviewDialog:
             }
 
             try:
-                if path.suffix.lower() in {'.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v'}:
+                if path.suffix.lower() in VIDEO_EXTS:
                     cap = cv2.VideoCapture(str(path))
                     if cap.isOpened():
                         details["Dimensions:"] = f"{int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))} x {int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))}"
@@ -935,25 +1746,30 @@ class ReviewDialog:
     def _ctx_action(self, is_original, action):
         if not hasattr(self, 'orig') or not hasattr(self, 'dupe'): return
         path = self.orig if is_original else self.dupe
+        path_str, system = str(path), platform.system()
         
         if action == 'copy':
-            self.top.clipboard_clear(); self.top.clipboard_append(str(path)); self.top.update()
+            self.top.clipboard_clear(); self.top.clipboard_append(path_str); self.top.update()
         elif action == 'file' and path.exists():
             try:
-                if platform.system() == 'Windows': os.startfile(path)
-                elif platform.system() == 'Darwin': subprocess.call(['open', path])
-                else: subprocess.call(['xdg-open', path])
+                if system == 'Windows': os.startfile(path_str)
+                elif system == 'Darwin': subprocess.call(['open', path_str])
+                else: subprocess.call(['xdg-open', path_str])
             except: pass
         elif action == 'folder' and path.exists():
             try:
-                if platform.system() == 'Windows': subprocess.Popen(f'explorer /select,"{path}"')
-                elif platform.system() == 'Darwin': subprocess.call(['open', '-R', path])
-                else: subprocess.call(['xdg-open', path.parent])
+                if system == 'Windows': subprocess.Popen(f'explorer /select,"{path_str}"')
+                elif system == 'Darwin': subprocess.call(['open', '-R', path_str])
+                else: subprocess.call(['xdg-open', os.path.dirname(path_str)])
             except: pass
         elif action == 'properties' and path.exists():
             self._show_properties(path)
 
 class DedupApp:
+    # Settings-tab variable -> settings key
+    SETTINGS_VARS = (('threshold_var', 'threshold'), ('threads_var', 'threads'), ('ignore_exts_var', 'ignore_exts'),
+                     ('ignore_folders_var', 'ignore_folders'), ('ssd_mode_var', 'ssd_mode'))
+
     def __init__(self):
         self.root = ctk.CTk()
         self.root.title("File Deduplicator Suite")
@@ -977,6 +1793,19 @@ class DedupApp:
         self.pause_event = threading.Event()
         self.pause_event.set()
         self.settings = self.cfg.load()
+        self._rebuild_ignore_sets()
+        self._ui_q = queue.SimpleQueue() # Workers never touch Tk directly; everything for the UI goes through here
+        self._closing = False
+        
+        # The persistent caches stay open for the whole session and are shared by every scan and merge (both classes
+        # serialize access with their own lock); they are closed in on_close
+        self.hash_store = self._open_store(HashCache, "hashcache.db")
+        self.fingerprint_store = self._open_store(FingerprintCache, "fingerprints.db")
+        
+        # Scans, merges and update checks run on one long-lived pool (they may overlap, never two of a kind)
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=3, thread_name_prefix="dedup")
+        self._update_future = None
+        self._scan_future = self._merge_future = None
         
         # Theme Setup
         ctk.set_appearance_mode("Dark")
@@ -984,7 +1813,7 @@ class DedupApp:
         
         self.icons = IconFactory.create_icons()
         
-        self.nb = ctk.CTkTabview(self.root)
+        self.nb = ctk.CTkTabview(self.root, command=self._on_tab_changed)
         self.nb.pack(fill="both", expand=True)
         
         self.t_audit = self.nb.add("Audit / Dedup")
@@ -994,8 +1823,11 @@ class DedupApp:
         f_log = ctk.CTkFrame(self.root, fg_color="transparent")
         f_log.pack(fill="x", padx=20, pady=(10, 5))
         ctk.CTkLabel(f_log, text="Activity Log:").pack(side="left", padx=5)
-        ctk.CTkButton(f_log, text="Clear Log", image=self.icons['trash'], compound="left", fg_color="gray", command=self.clear_log, width=100).pack(side="right")
-        ctk.CTkButton(f_log, text="Save Log", image=self.icons['save'], compound="left", fg_color="gray", command=self.save_log, width=100).pack(side="right", padx=10)
+        # Non-modal confirmations; a messagebox would block the main loop and stall the progress pump
+        self._toast_var = tk.StringVar(); self._toast_job = None
+        ctk.CTkLabel(f_log, textvariable=self._toast_var, text_color="#2CC985").pack(side="left", padx=10)
+        self._icon_button(f_log, "Clear Log", 'trash', self.clear_log, fg_color="gray", width=100).pack(side="right")
+        self._icon_button(f_log, "Save Log", 'save', self.save_log, fg_color="gray", width=100).pack(side="right", padx=10)
         
         self.log_area = ctk.CTkTextbox(self.root, height=150)
         self.log_area.pack(fill="x", padx=20, pady=(0, 10))
@@ -1005,8 +1837,9 @@ class DedupApp:
         
         self._init_audit_tab()
         self._init_merge_tab()
-        self._init_settings_tab()
+        self._settings_built = False # The Settings tab is rarely opened, so its widgets are built on first visit
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self._pump()
 
     def _center_window(self, width, height):
         screen_width = self.root.winfo_screenwidth()
@@ -1015,8 +1848,29 @@ class DedupApp:
         y = (screen_height - height) // 2
         self.root.geometry(f'{width}x{height}+{x}+{y}')
 
+    # Workers never touch Tk: log lines and progress go through a queue that _pump drains about 30 times a second,
+    # appending all new lines in one insert and applying only the latest progress value
     def log(self, msg):
-        self.root.after(0, lambda: self._log_ui(msg))
+        self._ui_q.put(("log", msg))
+
+    def _pump(self):
+        lines, prog = [], None
+        try:
+            for _ in range(10000):
+                try: kind, value = self._ui_q.get_nowait()
+                except queue.Empty: break
+                try:
+                    if kind == "log":
+                        lines.append(value)
+                        if len(lines) >= 500: break # One Text insert per tick stays short; the rest waits 33 ms
+                    elif kind == "toast": self._toast(*value)
+                    elif kind == "call": value[0](*value[1:])
+                    else: prog = value
+                except Exception as e: lines.append(f"UI update failed: {e}") # One bad item must not stall the queue
+            if lines: self._log_ui("\n".join(lines))
+            if prog: self._progress_ui(*prog)
+        finally:
+            self.root.after(33, self._pump)
 
     def _log_ui(self, msg):
         self.log_area.insert(tk.END, msg + "\n"); self.log_area.see(tk.END)
@@ -1032,12 +1886,23 @@ class DedupApp:
             except Exception as e: messagebox.showerror("Error", f"Could not save log: {e}")
 
     def progress(self, cur, tot, msg=""):
-        self.root.after(0, lambda: self._progress_ui(cur, tot, msg))
+        self._ui_q.put(("prog", (cur, tot, msg)))
 
     def _progress_ui(self, cur, tot, msg):
         if tot > 0: self.pbar.set(cur/tot)
         self.root.title(f"Dedup Suite - {msg}")
 
+    def _toast(self, msg, ms=2500):
+        if self._toast_job: self.root.after_cancel(self._toast_job)
+        self._toast_var.set(msg)
+        self._toast_job = self.root.after(ms, self._clear_toast)
+
+    def _clear_toast(self):
+        self._toast_job = None; self._toast_var.set("")
+
+    def _icon_button(self, parent, text, icon, cmd, **kw):
+        return ctk.CTkButton(parent, text=text, image=self.icons[icon], compound="left", command=cmd, **kw)
+
     def _init_audit_tab(self):
         f = ctk.CTkFrame(self.t_audit)
         f.pack(fill="x", padx=20, pady=20)
@@ -1045,7 +1910,7 @@ class DedupApp:
         ctk.CTkLabel(f, text="Source:").pack(side="left", padx=10, pady=10)
         self.src_var = tk.StringVar(value=self.settings["last_source"])
         ctk.CTkEntry(f, textvariable=self.src_var).pack(side="left", fill="x", expand=True, padx=10, pady=10)
-        ctk.CTkButton(f, text="Browse", image=self.icons['folder'], compound="left", command=lambda: self.src_var.set(filedialog.askdirectory())).pack(side="left", padx=10, pady=10)
+        self._icon_button(f, "Browse", 'folder', lambda: self.src_var.set(filedialog.askdirectory())).pack(side="left", padx=10, pady=10)
 
         f2 = ctk.CTkFrame(self.t_audit)
         f2.pack(fill="x", padx=20, pady=0)
@@ -1058,11 +1923,11 @@ class DedupApp:
         f_buttons = ctk.CTkFrame(f2, fg_color="transparent")
         f_buttons.pack(side="right", padx=10, pady=10)
         
-        self.btn_start = ctk.CTkButton(f_buttons, text="Start Scan", image=self.icons['play'], compound="left", fg_color="#2CC985", hover_color="#229966", command=self.start_audit)
+        self.btn_start = self._icon_button(f_buttons, "Start Scan", 'play', self.start_audit, fg_color="#2CC985", hover_color="#229966")
         self.btn_start.pack(side="left", padx=5)
-        self.btn_pause = ctk.CTkButton(f_buttons, text="Pause", image=self.icons['pause'], compound="left", fg_color="#E5A00D", hover_color="#B37D0A", command=self.toggle_pause, state="disabled")
+        self.btn_pause = self._icon_button(f_buttons, "Pause", 'pause', self.toggle_pause, fg_color="#E5A00D", hover_color="#B37D0A", state="disabled")
         self.btn_pause.pack(side="left", padx=5)
-        self.btn_stop = ctk.CTkButton(f_buttons, text="Stop", image=self.icons['stop'], compound="left", fg_color="#C92C2C", hover_color="#992222", command=self.stop_scan, state="disabled")
+        self.btn_stop = self._icon_button(f_buttons, "Stop", 'stop', self.stop_scan, fg_color="#C92C2C", hover_color="#992222", state="disabled")
         self.btn_stop.pack(side="left", padx=5)
 
     def _init_merge_tab(self):
@@ -1081,7 +1946,12 @@ class DedupApp:
         self.m_dry = tk.BooleanVar(value=True)
         ctk.CTkCheckBox(f, text="Dry Run (Simulate only)", variable=self.m_dry).pack(pady=10)
         
-        ctk.CTkButton(f, text="Start Merge", image=self.icons['play'], compound="left", fg_color="#2CC985", hover_color="#229966", command=self.start_merge).pack(pady=20)
+        self._icon_button(f, "Start Merge", 'play', self.start_merge, fg_color="#2CC985", hover_color="#229966").pack(pady=20)
+
+    def _on_tab_changed(self):
+        if not self._settings_built and self.nb.get() == "Settings":
+            self._settings_built = True
+            self._init_settings_tab()
 
     def _init_settings_tab(self):
         # Titled Frame for Settings
@@ -1099,30 +1969,35 @@ class DedupApp:
 
         # Threshold
         ctk.CTkLabel(f, text="Visual Similarity Threshold (0-20):").grid(row=0, column=0, sticky="w", padx=10, pady=5)
-        self.threshold_var = tk.IntVar(value=self.settings.get('threshold', 0))
+        self.threshold_var = tk.IntVar()
         ctk.CTkEntry(f, textvariable=self.threshold_var).grid(row=0, column=1, sticky="ew", padx=10, pady=5)
 
         # Threads
         ctk.CTkLabel(f, text="Processing Threads:").grid(row=1, column=0, sticky="w", padx=10, pady=5)
-        self.threads_var = tk.IntVar(value=self.settings.get('threads', 4))
+        self.threads_var = tk.IntVar()
         ctk.CTkEntry(f, textvariable=self.threads_var).grid(row=1, column=1, sticky="ew", padx=10, pady=5)
 
         # Ignore Extensions
         ctk.CTkLabel(f, text="Ignore Extensions (e.g. .txt,.log):").grid(row=2, column=0, sticky="w", padx=10, pady=5)
-        self.ignore_exts_var = tk.StringVar(value=self.settings.get('ignore_exts', ''))
+        self.ignore_exts_var = tk.StringVar()
         ctk.CTkEntry(f, textvariable=self.ignore_exts_var).grid(row=2, column=1, sticky="ew", padx=10, pady=5)
 
         # Ignore Folders
-        ctk.CTkLabel(f, text="Ignore Folders (e.g. .git,cache):").grid(row=3, column=0, sticky="w", padx=10, pady=5)
-        self.ignore_folders_var = tk.StringVar(value=self.settings.get('ignore_folders', ''))
+        ctk.CTkLabel(f, text="Ignore Folders (e.g. .git,cache,tmp*):").grid(row=3, column=0, sticky="w", padx=10, pady=5)
+        self.ignore_folders_var = tk.StringVar()
         ctk.CTkEntry(f, textvariable=self.ignore_folders_var).grid(row=3, column=1, sticky="ew", padx=10, pady=5)
+
+        # SSD Mode
+        self.ssd_mode_var = tk.BooleanVar()
+        ctk.CTkCheckBox(f, text=f"SSD Mode (use {SSD_THREADS} threads for exact scans)", variable=self.ssd_mode_var).grid(row=4, column=0, columnspan=2, sticky="w", padx=10, pady=5)
+        self._populate_vars_from_settings()
         
         # Action Buttons
         f_actions = ctk.CTkFrame(self.t_settings, fg_color="transparent")
         f_actions.pack(fill="x", padx=20, pady=10)
         
-        ctk.CTkButton(f_actions, text="Save Settings", image=self.icons['save'], compound="left", fg_color="gray", command=self.save_settings).pack(fill="x", pady=5)
-        ctk.CTkButton(f_actions, text="Reset to Defaults", image=self.icons['refresh'], compound="left", fg_color="gray", command=self.reset_settings).pack(fill="x", pady=5)
+        self._icon_button(f_actions, "Save Settings", 'save', self.save_settings, fg_color="gray").pack(fill="x", pady=5)
+        self._icon_button(f_actions, "Reset to Defaults", 'refresh', self.reset_settings, fg_color="gray").pack(fill="x", pady=5)
         
         f_extras = ctk.CTkFrame(self.t_settings, fg_color="transparent")
         f_extras.pack(fill="x", padx=20, pady=10)
@@ -1131,6 +2006,7 @@ class DedupApp:
         ctk.CTkButton(f_extras, text="Report Bug", command=self.report_bug).pack(side="left", expand=True, padx=5)
 
     def start_audit(self):
+        if self._scan_future and not self._scan_future.done(): return # One scan at a time
         self.stop_event.clear()
         self.pause_event.set()
         self.btn_start.configure(state="disabled")
@@ -1138,40 +2014,64 @@ class DedupApp:
         self.btn_pause.configure(state="normal", text="Pause")
         cls = VideoFileAuditor if self.mode_var.get() == "Visual/Video" else FileAuditor
 
-        ignore_exts = [e.strip() for e in self.settings.get('ignore_exts', '').split(',') if e.strip()]
-        ignore_folders = [f.strip() for f in self.settings.get('ignore_folders', '').split(',') if f.strip()]
+        # Exact scans are I/O-bound, so on SSDs they benefit from a deeper queue than the CPU-bound visual scan
+        threads = SSD_THREADS if cls is FileAuditor and self.settings.get('ssd_mode') else self.settings.get('threads', 4)
 
+        cfg = AuditConfig(self.settings.get('threshold', 0), threads, self._ignore_exts, self._ignore_folders)
+        store_kw = {'hash_store': self.hash_store} if cls is FileAuditor else {'fingerprint_store': self.fingerprint_store}
         auditor = cls(self.src_var.get(), log_callback=self.log, progress_callback=self.progress,
-                      review_mode=self.review_var.get(), stop_event=self.stop_event, pause_event=self.pause_event, threshold=self.settings.get('threshold', 0),
-                      threads=self.settings.get('threads', 4), ignore_exts=ignore_exts, ignore_folders=ignore_folders)
+                      review_mode=self.review_var.get(), stop_event=self.stop_event, pause_event=self.pause_event, config=cfg, **store_kw)
+        review = self.review_var.get()
         def run():
+            # UI follow-ups are queued for the pump rather than sent with root.after, which would race on_close's destroy
             try:
                 auditor.run()
-                if self.review_var.get():
+                if review:
                     if auditor.found_groups:
-                        self.root.after(0, self._show_review, auditor)
+                        self._ui_q.put(("call", (self._show_review, auditor)))
                     else:
                         self.log("Scan complete. No duplicates found.")
-                        self.root.after(0, lambda: messagebox.showinfo("Scan Complete", "No duplicates were found."))
+                        self._ui_q.put(("call", (messagebox.showinfo, "Scan Complete", "No duplicates were found.")))
             except Exception as e:
                 self.log(f"Error during scan: {e}")
             finally:
-                self.root.after(0, self.reset_scan_buttons)
-        threading.Thread(target=run).start()
+                self._ui_q.put(("call", (self.reset_scan_buttons,)))
+        self._scan_future = self._pool.submit(run)
 
     def _show_review(self, auditor):
-        self.review_dialog = ReviewDialog(self.root, auditor.found_groups, precomputed_hashes=getattr(auditor, 'hash_cache', {}), 
-                                          threshold=self.settings.get('threshold', 5))
+        # The dialog becomes the sole owner of the groups and fingerprints; the auditor drops its references
+        groups, hashes = auditor.found_groups, getattr(auditor, 'hash_cache', None)
+        auditor.found_groups = []; auditor.hash_cache = None
+        self.review_dialog = ReviewDialog(self.root, groups, precomputed_hashes=hashes, 
+                                          threshold=self.settings.get('threshold', 5), log_callback=self.log)
+
+    def _open_store(self, store_cls, filename):
+        try: return store_cls(os.path.join(self.cfg.base_path, filename))
+        except sqlite3.Error as e:
+            self.log(f"Cache {filename} unavailable, hashing everything: {e}")
+            return None
 
     def start_merge(self):
-        merger = FolderMerger(self.m_master.get(), self.m_inc.get(), log_callback=self.log, progress_callback=self.progress, dry_run=self.m_dry.get())
-        threading.Thread(target=merger.run).start()
+        if self._merge_future and not self._merge_future.done():
+            messagebox.showinfo("Merge", "A merge is already running.")
+            return
+        merger = FolderMerger(self.m_master.get(), self.m_inc.get(), log_callback=self.log, progress_callback=self.progress, dry_run=self.m_dry.get(),
+                              hash_store=self.hash_store)
+        self._merge_future = self._pool.submit(merger.run)
 
     def on_close(self):
+        if self._closing: return # A second WM_DELETE_WINDOW while tearing down
+        self._closing = True
         self.stop_event.set() # Signal any running threads to stop
         self.pause_event.set() # Unpause to allow threads to exit
+        if self.review_dialog: # Flush its targets and purge its staging dirs first; never let that block the exit
+            try: self.review_dialog._on_close()
+            except Exception: pass
         self.settings.update({"last_source": self.src_var.get(), "merge_master": self.m_master.get(), "merge_incoming": self.m_inc.get()})
         self.cfg.save(self.settings)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        for store in (self.hash_store, self.fingerprint_store):
+            if store: store.close()
         self.root.destroy()
 
     def stop_scan(self):
@@ -1194,31 +2094,73 @@ class DedupApp:
         self.btn_stop.configure(state="disabled")
         self.btn_pause.configure(state="disabled", text="Pause")
 
+    def _rebuild_ignore_sets(self):
+        # Parsed once per settings change rather than on every scan: lowercased, extensions dotted
+        exts = (e.strip().lower() for e in self.settings.get('ignore_exts', '').split(','))
+        self._ignore_exts = frozenset(e if e.startswith('.') else '.' + e for e in exts if e)
+        self._ignore_folders = frozenset(f.strip().lower() for f in self.settings.get('ignore_folders', '').split(',') if f.strip())
+
+    def _populate_vars_from_settings(self):
+        # Only changed values are written: every set() fires the var's traces, and CTk redraws bound widgets right away
+        for attr, key in self.SETTINGS_VARS:
+            var, value = getattr(self, attr), self.settings[key]
+            try:
+                if var.get() == value: continue
+            except tk.TclError: pass # Entry holds text that doesn't parse as the var's type
+            var.set(value)
+
     def save_settings(self):
-        self.settings['threshold'] = self.threshold_var.get()
-        self.settings['threads'] = self.threads_var.get()
-        self.settings['ignore_exts'] = self.ignore_exts_var.get()
-        self.settings['ignore_folders'] = self.ignore_folders_var.get()
+        for attr, key in self.SETTINGS_VARS: self.settings[key] = getattr(self, attr).get()
+        self._rebuild_ignore_sets()
         self.cfg.save(self.settings)
-        messagebox.showinfo("Settings", "Settings saved successfully.")
+        self._toast("Settings saved.")
 
     def check_updates(self):
-        # Placeholder for update logic
-        messagebox.showinfo("Updates", "You are running the latest version (v1.1.1).")
+        if self._update_future and not self._update_future.done(): return
+        self._toast("Checking for updates...", ms=10000)
+        self._update_future = self._pool.submit(self._fetch_release, self.settings.get('update_etag', ''), self.settings.get('update_latest', ''))
+
+    def _fetch_release(self, etag, cached_latest):
+        # Runs on the pool, so it only sees the values passed in and hands results back through _ui_q; the settings dict
+        # belongs to the Tk thread. The stored ETag turns a repeat check into a bodyless 304 answered from cached_latest.
+        req = urllib.request.Request(RELEASES_URL, headers={"Accept": "application/vnd.github+json", "User-Agent": "DedupSuite"})
+        if etag: req.add_header("If-None-Match", etag)
+        try:
+            with urllib.request.urlopen(req, timeout=10) as r:
+                latest = json_loads(r.read()).get('tag_name', '')
+                self._ui_q.put(("call", (self.settings.update, {'update_etag': r.headers.get('ETag', ''), 'update_latest': latest})))
+        except urllib.error.HTTPError as e:
+            if e.code != 304: self._ui_q.put(("toast", (f"Update check failed: HTTP {e.code}",))); return
+            latest = cached_latest
+        except (OSError, ValueError) as e:
+            self._ui_q.put(("toast", (f"Update check failed: {e}",))); return
+        version = lambda v: tuple(int(n) for n in re.findall(r'\d+', v))
+        if latest and version(latest) > version(APP_VERSION):
+            self._ui_q.put(("toast", (f"Version {latest.lstrip('v')} is available (you have v{APP_VERSION}).", 8000)))
+        else: self._ui_q.put(("toast", (f"You are running the latest version (v{APP_VERSION}).",)))
+
+    @functools.cached_property
+    def _shortcut_spec(self):
+        # (lnk path, target, arguments, working dir); fixed for the life of the process
+        desktop = Path(os.environ.get('USERPROFILE') or Path.home()) / 'Desktop'
+        exe = Path(sys.executable)
+        if getattr(sys, 'frozen', False): return str(desktop / "Dedup Suite.lnk"), str(exe), "", str(exe.parent)
+        script = Path(__file__).resolve()
+        pythonw = exe.with_name('pythonw.exe') # Only swap the file name, so venv and install paths are left alone
+        target = pythonw if exe.name.lower() == 'python.exe' and pythonw.exists() else exe
+        return str(desktop / "Dedup Suite.lnk"), str(target), f'"{script}"', str(script.parent)
 
     def create_shortcut(self):
         try:
-            desktop = os.path.join(os.environ['USERPROFILE'], 'Desktop')
-            lnk_path = os.path.join(desktop, "Dedup Suite.lnk")
-            
-            if getattr(sys, 'frozen', False):
-                target = sys.executable
-                args = ""
-                wdir = os.path.dirname(sys.executable)
-            else:
-                target = sys.executable.replace("python.exe", "pythonw.exe")
-                args = f'"{os.path.abspath(__file__)}"'
-                wdir = os.path.dirname(os.path.abspath(__file__))
+            lnk_path, target, args, wdir = self._shortcut_spec
+
+            if HAS_WIN32COM:
+                # In-process WSH call; no temp script or cscript launch
+                link = win32com.client.Dispatch("WScript.Shell").CreateShortCut(lnk_path)
+                link.TargetPath = target; link.Arguments = args; link.WorkingDirectory = wdir
+                link.Save()
+                self._toast("Shortcut created on Desktop!")
+                return
 
             vbs = f'Set oWS = WScript.CreateObject("WScript.Shell")\n' \
                   f'Set oLink = oWS.CreateShortcut("{lnk_path}")\n' \
@@ -1231,21 +2173,20 @@ class DedupApp:
             vbs_file.write_text(vbs)
             subprocess.run(['cscript', '/nologo', str(vbs_file)], check=True)
             vbs_file.unlink()
-            messagebox.showinfo("Success", "Shortcut created on Desktop!")
+            self._toast("Shortcut created on Desktop!")
         except Exception as e: messagebox.showerror("Error", f"Could not create shortcut: {e}")
 
     def report_bug(self):
-        messagebox.showinfo("Report Bug", "Please report any issues to support@example.com")
+        self._toast("Please report any issues to support@example.com", ms=8000)
 
     def reset_settings(self):
         if messagebox.askyesno("Reset Settings", "Are you sure you want to reset all settings to their defaults?"):
-            self.settings = self.cfg.defaults.copy()
-            self.threshold_var.set(self.settings['threshold'])
-            self.threads_var.set(self.settings['threads'])
-            self.ignore_exts_var.set(self.settings['ignore_exts'])
-            self.ignore_folders_var.set(self.settings['ignore_folders'])
-            messagebox.showinfo("Settings", "Settings reset to defaults. Click 'Save Settings' to persist changes.")
+            self.settings = dict(self.cfg.defaults)
+            self._rebuild_ignore_sets()
+            self._populate_vars_from_settings()
+            self._toast("Settings reset to defaults. Click 'Save Settings' to persist changes.", ms=5000)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = DedupApp()
     app.root.mainloop()
@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dedup_suite
+
+
+class _Var:
+    def __init__(self, value=""): self.value = value
+    def get(self): return self.value
+    def set(self, value): self.value = value
+
+
+def _bare_dialog(pairs):
+    # ReviewDialog without its Toplevel: only the state the pair/filter/undo logic touches
+    dlg = dedup_suite.ReviewDialog.__new__(dedup_suite.ReviewDialog)
+    dlg.stat_cache = {}
+    dlg.undo_stack = []
+    dlg.current_index = 0
+    dlg.all_pairs = list(pairs)
+    dlg.filter_var = _Var()
+    dlg._load_pair = lambda: None
+    dlg._set_pairs(dlg.all_pairs[:])
+    return dlg
+
+
+class UndoFilterSmartSelectTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.orig, self.dupe = root / "small.jpg", root / "big.jpg"
+        self.orig.write_bytes(b"x" * 10)
+        self.dupe.write_bytes(b"x" * 100)
+        self.staged = root / "staged.jpg"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_restored_pair_is_still_smart_selected(self):
+        dlg = _bare_dialog([(self.orig, self.dupe)])
+
+        # Delete the duplicate into staging, then undo it; both drop the cached stats of the paths involved
+        dedup_suite.fast_move(self.dupe, self.staged)
+        operations = [(self.staged, self.dupe)]
+        dlg._forget_stats(operations)
+        dlg.undo_stack.append((operations, 0))
+        dlg.undo_last()
+        self.assertTrue(self.dupe.exists())
+
+        dlg.filter_var.set(".jpg")
+        dlg.apply_filter()
+        self.assertEqual(dlg.pair_sizes.tolist(), [[10, 100]])
+
+        with mock.patch.object(dedup_suite.messagebox, "showinfo"):
+            dlg.smart_select()
+        self.assertEqual(dlg.pairs, [(self.dupe, self.orig)])
+
+
+if __name__ == "__main__":
+    unittest.main()